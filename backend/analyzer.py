@@ -1,7 +1,18 @@
 import ast
-from collections import defaultdict
+import hashlib
+import os
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-API_DECORATOR_KEYWORDS = {
+# The annotations below keep this module compilable with mypyc, e.g.
+# `mypyc analyzer.py`; the plain .py file remains the default fallback.
+Definition = Dict[str, Any]
+
+API_DECORATOR_KEYWORDS = frozenset({
     'route',
     'router',
     'get',
@@ -14,191 +25,317 @@ API_DECORATOR_KEYWORDS = {
     'api',
     'api_view',
     'endpoint'
-}
+})
+
+# Bump whenever the shape of analyze_file results changes, so stale cache
+# entries written by an older analyzer are ignored.
+CACHE_VERSION = 1
+
+# Every definition starts a line with one of these keywords, so a file
+# without a match has nothing to report and needn't be parsed.
+_DEFINITION_RE = re.compile(rb'^[ \t\f]*(?:class|def|async[ \t]+def)\b', re.M)
+
+# Marks the end of a class/function body on the walk stack.
+_SCOPE_EXIT = object()
+# Returned by handlers whose node has nothing left worth walking.
+_LEAF = object()
 
-class CodeAnalyzer(ast.NodeVisitor):
-    def __init__(self):
-        self.scopes = []
-        self.definitions = {}
-        self.aliases = {}
+
+class CodeAnalyzer:
+    __slots__ = ('scopes', 'definitions', '_name_canon', '_attr_base_canon', 'instance_attr_types',
+                 '_decorator_names', '_class_stack')
+
+    def __init__(self) -> None:
+        self.scopes: List[str] = []
+        # Names of the enclosing classes, innermost last
+        self._class_stack: List[str] = []
+        self.definitions: Dict[str, Definition] = {}
+        # Import aliases resolved up front: what a bare name stands for, and
+        # what it stands for as the base of an attribute access (module
+        # aliases only resolve in the latter case).
+        self._name_canon: Dict[str, str] = {}
+        self._attr_base_canon: Dict[str, str] = {}
         # Track instance attribute assignments: self.attr = ClassName()
         # Maps (class_name, attr_name) -> original_class_name
-        self.instance_attr_types = {}
+        self.instance_attr_types: Dict[Tuple[str, str], str] = {}
+        # Lowercased decorator names; the same few repeat across a file
+        self._decorator_names: Dict[str, str] = {}
 
-    def visit_ClassDef(self, node):
-        name = node.name
-        self.definitions[name] = {
-            'type': 'class',
-            'args': [],  # classes don't have args like functions
-            'start_line': node.lineno,
-            'end_line': node.end_lineno,
-            'used_names': set(),
-            'used_classes_methods': defaultdict(set),
-            'is_api_endpoint': False
-        }
-        self.scopes.append(name)
-        self.generic_visit(node)
-        self.scopes.pop()
+    def walk(self, tree: ast.AST) -> None:
+        """Depth-first walk of the tree with an explicit stack.
+
+        Each stack entry carries the definition dict of the enclosing scope,
+        so handlers record usages without going through self.scopes. Nodes
+        without a handler are only descended into.
+        """
+        handlers = _HANDLERS
+        AST = ast.AST
+        expr = ast.expr
+        stack: List[Tuple[Any, Any]] = [(tree, None)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node, current = pop()
+            if node is _SCOPE_EXIT:
+                self.scopes.pop()
+                if current['type'] == 'class':
+                    self._class_stack.pop()
+                _close_definition(current)
+                continue
+            if current is None and isinstance(node, expr):
+                # Outside any definition an expression records nothing, and
+                # can't contain a class or function, so skip it whole.
+                continue
+            node_type = type(node)
+            handler = handlers.get(node_type)
+            child_scope: object
+            if handler is not None:
+                child_scope = handler(self, node, current)
+                if child_scope is _LEAF:
+                    continue
+                if node_type in _SCOPE_NODES:
+                    # Walked after every child of the class/function body.
+                    push((_SCOPE_EXIT, child_scope))
+            else:
+                child_scope = current
+            # Push children in reverse so they pop in source order.
+            for field in reversed(node._fields):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for item in reversed(value):
+                        if isinstance(item, AST):
+                            push((item, child_scope))
+                elif isinstance(value, AST):
+                    push((value, child_scope))
+
+    def _handle_class(self, node: ast.ClassDef, current: Optional[Definition]) -> object:
+        self._class_stack.append(node.name)
+        # classes don't have args like functions
+        return self._enter_definition(node.name, 'class', node, [], False)
 
-    def visit_FunctionDef(self, node):
+    def _handle_function(self, node: Any, current: Optional[Definition]) -> object:
         name = node.name
-        full_name = f"{self.scopes[-1]}.{name}" if self.scopes and self.definitions[self.scopes[-1]]['type'] == 'class' else name
-        self.definitions[full_name] = {
-            'type': 'function',
-            'args': [arg.arg for arg in node.args.args],
+        full_name = f"{self.scopes[-1]}.{name}" if current is not None and current['type'] == 'class' else name
+        args = [arg.arg for arg in node.args.args]
+        return self._enter_definition(full_name, 'function', node, args, self._is_api_endpoint(node))
+
+    def _enter_definition(self, full_name: str, kind: str, node: Any, args: List[str],
+                          is_api_endpoint: bool) -> Definition:
+        """Register a class or function definition and open its scope."""
+        self.definitions[full_name] = definition = {
+            'type': kind,
+            'args': args,
             'start_line': node.lineno,
             'end_line': node.end_lineno,
-            'used_names': set(),
-            'used_classes_methods': defaultdict(set),
-            'is_api_endpoint': self._is_api_endpoint(node)
+            # Filled as lists while the body is walked, and turned into a
+            # set and a dict of sets by _close_definition at scope exit.
+            'used_names': [],
+            'used_classes_methods': [],
+            'is_api_endpoint': is_api_endpoint
         }
         self.scopes.append(full_name)
-        self.generic_visit(node)
-        self.scopes.pop()
-
-    def visit_AsyncFunctionDef(self, node):
-        self.visit_FunctionDef(node)  # Treat async as regular
+        return definition
 
-    def visit_Assign(self, node):
+    def _handle_assign(self, node: ast.Assign, current: Optional[Definition]) -> object:
         """Track self.attr = ClassName() assignments for instance attribute type inference."""
-        for target in node.targets:
-            if (isinstance(target, ast.Attribute) and 
-                isinstance(target.value, ast.Name) and 
-                target.value.id == 'self' and
-                self.scopes):
-                
-                # We're assigning to self.something
-                attr_name = target.attr
-                assigned_class = self._extract_class_from_value(node.value)
-                
-                if assigned_class:
-                    # Find the containing class
-                    current_class = self._get_current_class()
-                    if current_class:
-                        self.instance_attr_types[(current_class, attr_name)] = assigned_class
-        
-        self.generic_visit(node)
-    
-    def _extract_class_from_value(self, node):
+        if current is not None:
+            for target in node.targets:
+                if (isinstance(target, ast.Attribute) and
+                    isinstance(target.value, ast.Name) and
+                    target.value.id == 'self'):
+
+                    # We're assigning to self.something
+                    attr_name = target.attr
+                    assigned_class = self._extract_class_from_value(node.value)
+
+                    if assigned_class:
+                        # Find the containing class
+                        current_class = self._get_current_class()
+                        if current_class:
+                            self.instance_attr_types[(current_class, attr_name)] = assigned_class
+        return current
+
+    def _extract_class_from_value(self, node: ast.AST) -> Optional[str]:
         """Extract the class name from an assignment value (e.g., ClassName() or aliased_name())."""
         if isinstance(node, ast.Call):
             # It's a call like ClassName() or AliasedName()
             if isinstance(node.func, ast.Name):
                 # Resolve through import aliases
-                return self._canonical_name(node.func.id)
+                return self._name_canon.get(node.func.id, node.func.id)
             elif isinstance(node.func, ast.Attribute):
                 # module.ClassName()
                 return node.func.attr
         elif isinstance(node, ast.Name):
             # Direct assignment like self.attr = SomeClass (without call)
-            return self._canonical_name(node.id)
+            return self._name_canon.get(node.id, node.id)
         return None
     
-    def _get_current_class(self):
-        """Get the current class name from the scope stack."""
-        for scope in reversed(self.scopes):
-            if scope in self.definitions and self.definitions[scope]['type'] == 'class':
-                return scope
-        return None
+    def _get_current_class(self) -> Optional[str]:
+        """Get the current class name from the class stack."""
+        return self._class_stack[-1] if self._class_stack else None
 
-    def visit_Import(self, node):
+    def _handle_import(self, node: ast.Import, current: Optional[Definition]) -> object:
         for alias in node.names:
             if alias.asname:
-                self.aliases[alias.asname] = {
-                    'kind': 'module',
-                    'module': alias.name
-                }
+                self._name_canon.pop(alias.asname, None)
+                # Dotted module names aren't interned by the parser the way
+                # identifiers are; intern them once here so set lookups on
+                # them compare by identity.
+                self._attr_base_canon[alias.asname] = sys.intern(alias.name)
+        return _LEAF
 
-    def visit_ImportFrom(self, node):
-        module = node.module or ''
+    def _handle_import_from(self, node: ast.ImportFrom, current: Optional[Definition]) -> object:
         for alias in node.names:
             if alias.name == '*':
                 continue
             alias_name = alias.asname or alias.name
-            self.aliases[alias_name] = {
-                'kind': 'symbol',
-                'symbol': alias.name,
-                'module': module
-            }
-
-    def visit_Name(self, node):
-        if isinstance(node.ctx, ast.Load) and self.scopes:
-            canonical = self._canonical_name(node.id)
-            self.definitions[self.scopes[-1]]['used_names'].add(canonical)
-
-    def visit_Attribute(self, node):
-        if self.scopes:
-            # Check for self.attr.method pattern
-            if (isinstance(node.value, ast.Attribute) and 
-                isinstance(node.value.value, ast.Name) and 
-                node.value.value.id == 'self'):
-                # This is self.something.method_or_attr
-                attr_name = node.value.attr
-                method_name = node.attr
-                current_class = self._get_current_class()
-                
-                if current_class:
-                    # Try to resolve self.attr to its original class
-                    original_class = self.instance_attr_types.get((current_class, attr_name))
-                    if original_class:
-                        # We found the original class, record it as a used class method
-                        self.definitions[self.scopes[-1]]['used_classes_methods'][original_class].add(method_name)
-                        self.generic_visit(node)
-                        return
-            
-            # Original logic: base.method pattern
-            if isinstance(node.value, ast.Name):
-                base_name = self._canonical_attr_base(node.value.id)
-                self.definitions[self.scopes[-1]]['used_classes_methods'][base_name].add(node.attr)
-        
-        self.generic_visit(node)
+            name = sys.intern(alias.name)
+            self._name_canon[alias_name] = name
+            self._attr_base_canon[alias_name] = name
+        return _LEAF
+
+    def _handle_name(self, node: ast.Name, current: Optional[Definition]) -> object:
+        if current is not None and isinstance(node.ctx, ast.Load):
+            name = node.id
+            current['used_names'].append(self._name_canon.get(name, name))
+        return _LEAF
+
+    def _handle_attribute(self, node: ast.Attribute, current: Optional[Definition]) -> object:
+        if current is None:
+            return current
+        value = node.value
+        # Check for self.attr.method pattern
+        if (isinstance(value, ast.Attribute) and
+            isinstance(value.value, ast.Name) and
+            value.value.id == 'self'):
+            # This is self.something.method_or_attr
+            current_class = self._get_current_class()
+            if current_class:
+                # Try to resolve self.attr to its original class
+                original_class = self.instance_attr_types.get((current_class, value.attr))
+                if original_class:
+                    # We found the original class, record it as a used class method
+                    current['used_classes_methods'].append((original_class, node.attr))
+                    return current
+
+        # Original logic: base.method pattern
+        if isinstance(value, ast.Name):
+            base_name = self._attr_base_canon.get(value.id, value.id)
+            current['used_classes_methods'].append((base_name, node.attr))
+        return current
 
     # No need for imports anymore, since we skip external
 
-    def _canonical_name(self, name):
-        info = self.aliases.get(name)
-        if not info:
-            return name
-        if info.get('kind') == 'symbol':
-            return info.get('symbol', name)
-        return name
-
-    def _canonical_attr_base(self, name):
-        info = self.aliases.get(name)
-        if not info:
-            return name
-        if info.get('kind') == 'symbol':
-            return info.get('symbol', name)
-        if info.get('kind') == 'module':
-            return info.get('module', name)
-        return name
-
-    def _is_api_endpoint(self, node):
+    def _is_api_endpoint(self, node: Any) -> bool:
         for decorator in getattr(node, 'decorator_list', []):
             target = decorator
             while isinstance(target, ast.Call):
                 target = target.func
-            names = []
             while isinstance(target, ast.Attribute):
-                names.append(target.attr.lower())
+                if self._lower_decorator_name(target.attr) in API_DECORATOR_KEYWORDS:
+                    return True
                 target = target.value
-            if isinstance(target, ast.Name):
-                names.append(target.id.lower())
-            if any(name in API_DECORATOR_KEYWORDS for name in names):
+            if isinstance(target, ast.Name) and self._lower_decorator_name(target.id) in API_DECORATOR_KEYWORDS:
                 return True
         return False
 
-def analyze_file(file_path):
+    def _lower_decorator_name(self, name: str) -> str:
+        lowered = self._decorator_names.get(name)
+        if lowered is None:
+            lowered = self._decorator_names[name] = name.lower()
+        return lowered
+
+def _close_definition(definition: Definition) -> None:
+    """Collapse the usages recorded while walking a definition's body."""
+    definition['used_names'] = set(definition['used_names'])
+    used: Dict[str, Set[str]] = {}
+    for base, attr in definition['used_classes_methods']:
+        methods = used.get(base)
+        if methods is None:
+            methods = used[base] = set()
+        methods.add(attr)
+    definition['used_classes_methods'] = used
+
+_HANDLERS: Dict[type, Callable[[CodeAnalyzer, Any, Optional[Definition]], object]] = {
+    ast.ClassDef: CodeAnalyzer._handle_class,
+    ast.FunctionDef: CodeAnalyzer._handle_function,
+    ast.AsyncFunctionDef: CodeAnalyzer._handle_function,  # Treat async as regular
+    ast.Assign: CodeAnalyzer._handle_assign,
+    ast.Import: CodeAnalyzer._handle_import,
+    ast.ImportFrom: CodeAnalyzer._handle_import_from,
+    ast.Name: CodeAnalyzer._handle_name,
+    ast.Attribute: CodeAnalyzer._handle_attribute,
+}
+
+_SCOPE_NODES = frozenset((ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+
+def analyze_file(file_path: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    if cache_dir is None:
+        return _analyze_file(file_path)
+
+    # Entries are keyed on the file's path and validated against its
+    # modification time and size, so unchanged files skip parsing entirely.
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return _analyze_file(file_path)
+    key = hashlib.sha256(f'{CACHE_VERSION}:{os.path.abspath(file_path)}'.encode('utf-8')).hexdigest()
+    cache_path = os.path.join(cache_dir, key + '.pickle')
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(cache_path, 'rb') as f:
+            mtime_ns, size, result = pickle.load(f)
+        if mtime_ns == st.st_mtime_ns and size == st.st_size:
+            return result
+    except Exception:
+        pass  # missing or unreadable entry, analyze again
+
+    result = _analyze_file(file_path)
+    if result is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((st.st_mtime_ns, st.st_size, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Could not cache analysis of {file_path}: {e}")
+    return result
+
+def _analyze_file(file_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        # Unbuffered: the whole file is read in one call sized from fstat,
+        # and ast.parse decodes the bytes itself.
+        with open(file_path, 'rb', buffering=0) as f:
             source = f.read()
+        if _DEFINITION_RE.search(source) is None:
+            return {'definitions': {}}
         tree = ast.parse(source, filename=file_path)
         analyzer = CodeAnalyzer()
-        analyzer.visit(tree)
+        analyzer.walk(tree)
         return {'definitions': analyzer.definitions}
     except SyntaxError as e:
         print(f"Syntax error in {file_path}: {e}")
         return None
     except Exception as e:
         print(f"Error analyzing {file_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def analyze_files(file_paths: Iterable[str], workers: Optional[int] = None,
+                  cache_dir: Optional[str] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Analyze many files, spreading the work over a process pool.
+
+    Parsing and walking is pure CPU work that holds the GIL, so separate
+    processes are used rather than threads. Returns a dict mapping each path
+    to its analyze_file result, in the order the paths were given. Results
+    are cached under cache_dir when one is given.
+    """
+    file_paths = list(file_paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(file_paths))
+    if workers <= 1:
+        return {path: analyze_file(path, cache_dir) for path in file_paths}
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(partial(analyze_file, cache_dir=cache_dir), file_paths, chunksize=chunksize)
+        return dict(zip(file_paths, results))
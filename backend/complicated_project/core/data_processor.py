@@ -2,35 +2,54 @@
 Core data processing functionality.
 """
 
+from dataclasses import dataclass, asdict, replace
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import time
 from models.data_models import DataPoint, Dataset
 from utils.logger import Logger
 from utils.validators import DataValidator
-from utils.config_manager import ConfigManager
+from utils.config_manager import get_config_manager
+
+@dataclass(slots=True)
+class ProcessingStats:
+    """Running totals of process() results.
+
+    Also readable by key (stats['successful']), as when it was a dict.
+    """
+
+    total_processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    average_time: float = 0.0
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def copy(self) -> 'ProcessingStats':
+        return replace(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 class DataProcessor:
     """Main data processing engine."""
 
+    __slots__ = ('logger', 'validator', 'config', 'processing_stats')
+
     def __init__(self):
         self.logger = Logger("DataProcessor")
         self.validator = DataValidator()
-        self.config = ConfigManager()
-        self.processing_stats = {
-            'total_processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'average_time': 0.0
-        }
+        self.config = get_config_manager()
+        self.processing_stats = ProcessingStats()
 
     def initialize(self):
         """Initialize the data processor."""
         self.logger.info("Initializing Data Processor")
         self.config.load_config()
 
-    def process(self, raw_data: Dict) -> Dict[str, Any]:
-        """Process raw user data."""
+    def process(self, raw_data: Dict, record_stats: bool = True) -> Dict[str, Any]:
+        """Process raw user data, counting the result in processing_stats unless record_stats is False."""
         start_time = time.time()
 
         try:
@@ -53,7 +72,8 @@ class DataProcessor:
             processing_time = time.time() - start_time
 
             # Update stats
-            self._update_processing_stats(True, processing_time)
+            if record_stats:
+                self._update_processing_stats(True, processing_time)
 
             result = {
                 'dataset': processed_dataset,
@@ -67,7 +87,8 @@ class DataProcessor:
 
         except Exception as e:
             processing_time = time.time() - start_time
-            self._update_processing_stats(False, processing_time)
+            if record_stats:
+                self._update_processing_stats(False, processing_time)
             self.logger.error(f"Data processing failed: {str(e)}")
             return {
                 'error': str(e),
@@ -128,54 +149,51 @@ class DataProcessor:
 
     def _apply_transformations(self, dataset: Dataset):
         """Apply data transformations."""
-        for point in dataset.points:
-            # Apply normalization
-            point.normalize()
+        # Scaling is configured per run, not per point
+        scale_factor = self.config.get('processing.scale_factor', 1.0)
 
-            # Apply scaling if configured
-            scale_factor = self.config.get('processing.scale_factor', 1.0)
-            if isinstance(point.value, (int, float)):
-                point.value *= scale_factor
+        # Apply normalization and scaling if configured
+        dataset.normalize_points(scale_factor)
 
     def _calculate_derived_metrics(self, dataset: Dataset):
         """Calculate derived metrics for the dataset."""
-        if not dataset.points:
+        if not dataset.values:
             return
 
         # Calculate moving averages, trends, etc.
-        values = [p.value for p in dataset.points if isinstance(p.value, (int, float))]
+        values = [value for value in dataset.values if isinstance(value, (int, float))]
 
         if values:
+            count = len(values)
             dataset.metadata = {
-                'mean': sum(values) / len(values),
+                'mean': sum(values) / count,
                 'min': min(values),
                 'max': max(values),
-                'count': len(values)
+                'count': count
             }
 
     def _update_processing_stats(self, success: bool, processing_time: float):
         """Update processing statistics."""
-        self.processing_stats['total_processed'] += 1
+        stats = self.processing_stats
+        stats.total_processed += 1
 
         if success:
-            self.processing_stats['successful'] += 1
+            stats.successful += 1
         else:
-            self.processing_stats['failed'] += 1
+            stats.failed += 1
+
+        # Update running average incrementally, without rebuilding the total
+        stats.average_time += (processing_time - stats.average_time) / stats.total_processed
 
-        # Update rolling average
-        total_time = self.processing_stats['average_time'] * (self.processing_stats['total_processed'] - 1)
-        self.processing_stats['average_time'] = (total_time + processing_time) / self.processing_stats['total_processed']
+    def record_result(self, result: Dict[str, Any]):
+        """Count a result of process() run by another processor, such as one in a worker process."""
+        self._update_processing_stats(result.get('status') == 'success', result.get('processing_time', 0.0))
 
     def get_processing_stats(self) -> Dict[str, Any]:
         """Get current processing statistics."""
-        return self.processing_stats.copy()
+        return self.processing_stats.to_dict()
 
     def reset_stats(self):
         """Reset processing statistics."""
-        self.processing_stats = {
-            'total_processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'average_time': 0.0
-        }
+        self.processing_stats = ProcessingStats()
         self.logger.info("Processing statistics reset")
\ No newline at end of file
@@ -6,20 +6,43 @@ from typing import Dict, List, Optional, Any
 from models.user import User
 from utils.logger import Logger, AuditLogger
 from utils.validators import InputValidator
-from utils.config_manager import ConfigManager
+from utils.config_manager import get_config_manager
 import json
 import os
 
 class UserManager:
-    """Manages user operations and data."""
+    """Manages user operations and data.
+
+    Changes are appended to a journal next to the users file instead of
+    rewriting the whole file each time; the journal is replayed on load and
+    folded back into the users file once it grows past a threshold.
+    """
+
+    __slots__ = (
+        'logger', 'audit_logger', 'validator', 'config', 'users', 'user_data_file',
+        'user_journal_file', '_journal_entries', '_users_file_read', '_email_index',
+        '_search_index', '_user_objs'
+    )
+
+    # Journal entries written before it is compacted into the users file
+    JOURNAL_COMPACT_THRESHOLD = 1000
 
     def __init__(self):
         self.logger = Logger("UserManager")
         self.audit_logger = AuditLogger()
         self.validator = InputValidator()
-        self.config = ConfigManager()
+        self.config = get_config_manager()
         self.users = {}  # In production, this would be a database
         self.user_data_file = "data/users.json"
+        self.user_journal_file = "data/users.log"
+        self._journal_entries = 0
+        # Whether users.json was read, or found missing, by _load_users; until
+        # then it isn't overwritten, so an unreadable file isn't lost
+        self._users_file_read = False
+        # Lookup indexes kept in step with self.users
+        self._email_index = {}  # lowercase email -> user_id
+        self._search_index = {}  # user_id -> (lowercase name, lowercase email)
+        self._user_objs = {}  # user_id -> User built from self.users, dropped on change
 
     def initialize(self):
         """Initialize the user manager."""
@@ -27,11 +50,14 @@ class UserManager:
         self.config.load_config()
         self._load_users()
 
+    def close(self):
+        """Close the audit log file."""
+        self.audit_logger.close()
+
     def get_user(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        user_data = self.users.get(user_id)
-        if user_data:
-            user = User(**user_data)
+        if user_id in self.users:
+            user = self._get_user_obj(user_id)
             self.audit_logger.log_data_access(user_id, "user_profile", "read")
             return user
         return None
@@ -57,7 +83,9 @@ class UserManager:
 
         # Save user
         self.users[user_id] = user.to_dict()
-        self._save_users()
+        self._index_user(user_id, self.users[user_id])
+        self._user_objs[user_id] = user
+        self._journal_change('set', user_id, self.users[user_id])
 
         self.audit_logger.log_security_event("user_created", user_id, {"email": user.email})
         self.logger.info(f"User created: {user_id} - {user.name}")
@@ -78,10 +106,13 @@ class UserManager:
 
         # Apply updates
         user_data = self.users[user_id]
+        self._unindex_user(user_id, user_data)
+        self._user_objs.pop(user_id, None)
         user_data.update(updates)
+        self._index_user(user_id, user_data)
         user_data['updated_at'] = user_data['updated_at']  # This would be handled by the model
 
-        self._save_users()
+        self._journal_change('set', user_id, user_data)
 
         self.audit_logger.log_security_event("user_updated", user_id, {"fields": list(updates.keys())})
         self.logger.info(f"User updated: {user_id}")
@@ -96,7 +127,9 @@ class UserManager:
 
         user_data = self.users[user_id]
         del self.users[user_id]
-        self._save_users()
+        self._unindex_user(user_id, user_data)
+        self._user_objs.pop(user_id, None)
+        self._journal_change('del', user_id)
 
         self.audit_logger.log_security_event("user_deleted", user_id, {"email": user_data.get('email')})
         self.logger.info(f"User deleted: {user_id}")
@@ -105,28 +138,26 @@ class UserManager:
 
     def get_active_users(self) -> List[User]:
         """Get all active users."""
-        active_users = []
-        for user_data in self.users.values():
-            if user_data.get('is_active', True):
-                user = User(**user_data)
-                active_users.append(user)
+        active_users = [
+            self._get_user_obj(user_id)
+            for user_id, user_data in self.users.items()
+            if user_data.get('is_active', True)
+        ]
 
         self.logger.info(f"Retrieved {len(active_users)} active users")
         return active_users
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user credentials."""
-        for user_data in self.users.values():
-            if user_data['email'] == email:
-                user = User(**user_data)
-                if user.authenticate(password):
-                    user.last_login = user.last_login  # This would be updated
-                    self.audit_logger.log_security_event("user_login", user.id, {"email": email})
-                    self.logger.info(f"User authenticated: {user.id}")
-                    return user
-                else:
-                    self.audit_logger.log_security_event("login_failed", user.id, {"email": email})
-                    break
+        user_id = self._email_index.get(email.lower())
+        if user_id is not None:
+            user = self._get_user_obj(user_id)
+            if user.authenticate(password):
+                user.last_login = user.last_login  # This would be updated
+                self.audit_logger.log_security_event("user_login", user.id, {"email": email})
+                self.logger.info(f"User authenticated: {user.id}")
+                return user
+            self.audit_logger.log_security_event("login_failed", user.id, {"email": email})
 
         self.logger.warning(f"Authentication failed for email: {email}")
         return None
@@ -136,11 +167,9 @@ class UserManager:
         results = []
         query_lower = query.lower()
 
-        for user_data in self.users.values():
-            if (query_lower in user_data['name'].lower() or
-                query_lower in user_data['email'].lower()):
-                user = User(**user_data)
-                results.append(user)
+        for user_id, (name_lower, email_lower) in self._search_index.items():
+            if query_lower in name_lower or query_lower in email_lower:
+                results.append(self._get_user_obj(user_id))
 
         self.logger.info(f"User search for '{query}' returned {len(results)} results")
         return results
@@ -173,16 +202,123 @@ class UserManager:
             else:
                 self.users = {}
                 self.logger.info("No user data file found, starting with empty user list")
+            self._users_file_read = True
         except Exception as e:
             self.logger.error(f"Failed to load users: {str(e)}")
             self.users = {}
+        # An unreadable users file keeps its journal, rather than being
+        # replaced by the journaled users alone
+        if self._replay_journal() and self._users_file_read:
+            self._compact_journal()
+        self._rebuild_indexes()
+
+    def _get_user_obj(self, user_id) -> User:
+        """Get the User object for a stored user, building it on first use."""
+        user = self._user_objs.get(user_id)
+        if user is None:
+            user = User(**self.users[user_id])
+            self._user_objs[user_id] = user
+        return user
+
+    def _rebuild_indexes(self):
+        """Rebuild the email and search indexes from self.users."""
+        self._email_index = {}
+        self._search_index = {}
+        self._user_objs = {}
+        for user_id, user_data in self.users.items():
+            self._index_user(user_id, user_data)
+
+    def _index_user(self, user_id, user_data: Dict[str, Any]):
+        """Add a user to the lookup indexes."""
+        email_lower = user_data['email'].lower()
+        # Keep the first user registered under an email, as a full scan would find
+        self._email_index.setdefault(email_lower, user_id)
+        self._search_index[user_id] = (user_data['name'].lower(), email_lower)
+
+    def _unindex_user(self, user_id, user_data: Dict[str, Any]):
+        """Remove a user from the lookup indexes."""
+        email_lower = user_data['email'].lower()
+        if self._email_index.get(email_lower) == user_id:
+            del self._email_index[email_lower]
+        self._search_index.pop(user_id, None)
+
+    def _journal_change(self, op: str, user_id, user_data: Dict[str, Any] = None):
+        """Append a user change to the journal, compacting it when it gets long."""
+        record = {'op': op, 'id': user_id}
+        if user_data is not None:
+            record['data'] = user_data
+        try:
+            os.makedirs(os.path.dirname(self.user_journal_file), exist_ok=True)
+            with open(self.user_journal_file, 'a') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        except Exception as e:
+            # Fall back to writing everything so the change isn't lost
+            self.logger.error(f"Failed to journal user change: {str(e)}")
+            self._save_users()
+            return
+
+        self._journal_entries += 1
+        if self._journal_entries >= self.JOURNAL_COMPACT_THRESHOLD:
+            self._compact_journal()
+
+    def _replay_journal(self) -> int:
+        """Apply journaled changes on top of the loaded users, returning how many were applied."""
+        if not os.path.exists(self.user_journal_file):
+            return 0
+
+        applied = 0
+        with open(self.user_journal_file, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final write from a crash; everything before it stands
+                    self.logger.warning("Skipping unreadable user journal entry")
+                    continue
+                # Keys come back as strings once the users file is reloaded
+                user_id = str(record['id'])
+                if record['op'] == 'del':
+                    self.users.pop(user_id, None)
+                else:
+                    self.users[user_id] = record['data']
+                applied += 1
+
+        self.logger.info(f"Replayed {applied} journaled user changes")
+        return applied
+
+    def _compact_journal(self):
+        """Write all users to storage and start a new, empty journal."""
+        if not self._save_users():
+            return
+        try:
+            if os.path.exists(self.user_journal_file):
+                os.remove(self.user_journal_file)
+            self._journal_entries = 0
+        except Exception as e:
+            self.logger.error(f"Failed to truncate user journal: {str(e)}")
 
-    def _save_users(self):
-        """Save users to storage."""
+    def _save_users(self) -> bool:
+        """Save users to storage.
+
+        The file is replaced atomically, so a failed save leaves the previous
+        one in place. Nothing is written if the file couldn't be read on load.
+        """
+        if not self._users_file_read:
+            self.logger.error(f"Not saving users: {self.user_data_file} was not loaded")
+            return False
         try:
             os.makedirs(os.path.dirname(self.user_data_file), exist_ok=True)
-            with open(self.user_data_file, 'w') as f:
-                json.dump(self.users, f, indent=2)
+            # json.dumps encodes in one C call; json.dump would stream the
+            # file through the pure-Python encoder, indent or not
+            text = json.dumps(self.users, separators=(',', ':'))
+            temp_file = self.user_data_file + '.tmp'
+            with open(temp_file, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.user_data_file)
             self.logger.debug("Users saved to storage")
+            return True
         except Exception as e:
-            self.logger.error(f"Failed to save users: {str(e)}")
\ No newline at end of file
+            self.logger.error(f"Failed to save users: {str(e)}")
+            return False
\ No newline at end of file
@@ -4,71 +4,401 @@ Database abstraction layer for the complex system.
 
 from typing import Dict, List, Any, Optional, TypeVar, Generic
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from operator import itemgetter
+from urllib.request import pathname2url
+import os
+import queue
 import sqlite3
+import threading
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from utils.logger import Logger
 from utils.config_manager import ConfigManager
 
+try:
+    import orjson
+except ImportError:  # optional, the stdlib json module is used without it
+    orjson = None
+
 T = TypeVar('T')
 
+# INSERT and UPDATE can hand back the written row (SQLite 3.35+)
+_RETURNING = ' RETURNING *' if sqlite3.sqlite_version_info >= (3, 35, 0) else ''
+
+# JSON columns hold UTF-8 encoded BLOBs; both loaders also accept the TEXT
+# values written before JSON_COLUMNS were migrated.
+if orjson is not None:
+    def _dump_json(value: Any) -> bytes:
+        """Encode a value for a JSON BLOB column."""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    _load_json = orjson.loads
+else:
+    def _dump_json(value: Any) -> bytes:
+        """Encode a value for a JSON BLOB column."""
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    _load_json = json.loads
+
+# Columns holding JSON-encoded values, by table
+JSON_COLUMNS = {
+    'users': ('raw_data', 'preferences'),
+    'reports': ('data',),
+}
+
+# Timestamps are stored as INTEGER microseconds since 1970-01-01 in the
+# naive local time the models use, so reading one is integer arithmetic
+# rather than ISO string parsing
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Columns computed by SQLite from a JSON column, by table, as (column,
+# JSON column, path). JSON columns are BLOBs, which the json functions
+# refuse, so they are read back as TEXT first.
+GENERATED_COLUMNS = {
+    'users': (
+        ('primary_sensor', 'raw_data', '$.data_points[0].source'),
+    ),
+}
+
+def _generated_column_sql(column: str, source: str, path: str) -> str:
+    """Column definition for a VIRTUAL column extracted from JSON."""
+    return f"{column} TEXT GENERATED ALWAYS AS (json_extract(CAST({source} AS TEXT), '{path}')) VIRTUAL"
+
+# Columns holding timestamps, by table
+TIMESTAMP_COLUMNS = {
+    'users': ('last_login', 'created_at', 'updated_at'),
+    'reports': ('created_at', 'generated_at'),
+}
+
+def _dump_timestamp(value: Optional[datetime]) -> Optional[int]:
+    """Encode a datetime for a timestamp column."""
+    if value is None:
+        return None
+    return (value - _EPOCH) // _MICROSECOND
+
+def _load_timestamp(value: Any) -> Optional[datetime]:
+    """Decode a timestamp column value."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Tables created before the switch declare these columns TEXT, which
+        # turns stored integers into digit strings; older rows hold ISO text
+        try:
+            value = int(value)
+        except ValueError:
+            return datetime.fromisoformat(value)
+    return _EPOCH + timedelta(microseconds=value)
+
 class DatabaseConnection:
     """Database connection manager."""
 
-    def __init__(self, db_path: str = "data/complex_system.db"):
+    # Applied to every read connection: a 64MB page cache plus 256MB memory
+    # map to keep hot pages out of read() calls
+    READ_PRAGMAS = (
+        "temp_store=MEMORY",
+        "cache_size=-64000",
+        "mmap_size=268435456",
+    )
+    # Applied to the main connection as well: write-ahead logging so readers
+    # don't block the writer, and fsync only at checkpoints
+    PRAGMAS = ("journal_mode=WAL", "synchronous=NORMAL") + READ_PRAGMAS
+
+    DEFAULT_READ_POOL_SIZE = 4
+
+    def __init__(self, db_path: str = "data/complex_system.db", config: ConfigManager = None):
         self.db_path = db_path
         self.connection = None
         self.logger = Logger("Database")
+        # Transactions belong to the thread that opened them: the nesting
+        # depth is thread-local, and the write lock, held for the whole of a
+        # transaction, keeps other threads' statements on the shared
+        # connection from joining it
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        # Bumped on every rollback so caches of written rows know to drop them
+        self.rollback_count = 0
+        # Repositories' find_by_id row caches, by table. They belong to the
+        # connection so every repository on it sees the others' writes
+        self._row_caches = {}
+
+        # Read-only connections used by fetch_one/fetch_all, opened on demand
+        # up to read_pool_size; 0 sends every read to the main connection
+        self.read_pool_size = (
+            config.get('database.read_pool_size', self.DEFAULT_READ_POOL_SIZE) if config
+            else self.DEFAULT_READ_POOL_SIZE
+        )
+        self._idle_readers = queue.LifoQueue()
+        # Every open pooled connection, idle or in use, so disconnect() can
+        # close them all; _reader_count also counts ones still being opened
+        self._readers = set()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+
+    @property
+    def _transaction_depth(self) -> int:
+        """How many transaction() blocks the calling thread is inside."""
+        return getattr(self._local, 'transaction_depth', 0)
+
+    @_transaction_depth.setter
+    def _transaction_depth(self, depth: int):
+        self._local.transaction_depth = depth
 
     def connect(self):
         """Establish database connection."""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # Autocommit mode: transactions are opened explicitly by transaction()
+            self.connection = sqlite3.connect(
+                self.db_path, isolation_level=None, check_same_thread=False, cached_statements=256
+            )
             self.connection.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                self.connection.execute(f"PRAGMA {pragma}")
             self.logger.info(f"Connected to database: {self.db_path}")
         except Exception as e:
             self.logger.error(f"Failed to connect to database: {str(e)}")
             raise
 
     def disconnect(self):
-        """Close database connection."""
+        """Close database connection, and the read connections with it."""
+        with self._reader_lock:
+            while True:
+                try:
+                    self._idle_readers.get_nowait()
+                except queue.Empty:
+                    break
+            for reader in self._readers:
+                reader.close()
+            self._readers.clear()
+            self._reader_count = 0
         if self.connection:
             self.connection.close()
             self.connection = None
             self.logger.info("Database connection closed")
 
-    def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
-        """Execute a database query."""
+    @contextmanager
+    def reader(self):
+        """Connection to run a read on.
+
+        Outside a transaction this is a pooled read-only connection, so reads
+        don't queue behind writes on the main connection. Inside one of the
+        calling thread's transactions it is the main connection, which can
+        see the transaction's uncommitted writes.
+        """
         if not self.connection:
             raise Exception("No database connection")
 
+        if self._transaction_depth:
+            # This thread's transaction, whose write lock it already holds
+            yield self.connection
+            return
+        if not self.read_pool_size or self.db_path == ':memory:' or self.db_path.startswith('file:'):
+            with self._write_lock:
+                yield self.connection
+            return
+
+        reader = self._acquire_reader()
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            self.connection.commit()
-            return cursor
-        except Exception as e:
-            self.logger.error(f"Query execution failed: {str(e)}")
-            self.connection.rollback()
+            yield reader
+        finally:
+            self._release_reader(reader)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take an idle read connection, or open one.
+
+        Past read_pool_size connections in use, as when one thread holds
+        several open iter_all() generators, an extra connection is opened
+        rather than waiting for one to come back; it is closed on release.
+        """
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_lock:
+            pooled = self._reader_count < self.read_pool_size
+            if pooled:
+                self._reader_count += 1
+        if not pooled:
+            self.logger.debug("Read pool exhausted, opening an overflow connection")
+            return self._open_reader()
+
+        try:
+            reader = self._open_reader()
+        except Exception:
+            with self._reader_lock:
+                self._reader_count -= 1
             raise
+        with self._reader_lock:
+            self._readers.add(reader)
+        return reader
+
+    def _release_reader(self, reader: sqlite3.Connection):
+        """Return a read connection to the pool, or close it if it isn't pooled."""
+        with self._reader_lock:
+            pooled = reader in self._readers
+        if pooled:
+            self._idle_readers.put(reader)
+        else:
+            # An overflow connection, or one that disconnect() already closed
+            reader.close()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database."""
+        uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        reader = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+        reader.row_factory = sqlite3.Row
+        for pragma in self.READ_PRAGMAS:
+            reader.execute(f"PRAGMA {pragma}")
+        return reader
+
+    def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Execute a database query without committing.
+
+        Writes are committed by the enclosing transaction(); single-statement
+        writes outside one should use execute_commit.
+        """
+        if not self.connection:
+            raise Exception("No database connection")
+
+        with self._write_lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute(query, params)
+                return cursor
+            except Exception as e:
+                self.logger.error(f"Query execution failed: {str(e)}")
+                if not self._transaction_depth:
+                    self._rollback()
+                raise
+
+    def execute_many(self, query: str, params_seq) -> sqlite3.Cursor:
+        """Execute a query once per parameter tuple without committing."""
+        if not self.connection:
+            raise Exception("No database connection")
+
+        with self._write_lock:
+            try:
+                return self.connection.executemany(query, params_seq)
+            except Exception as e:
+                self.logger.error(f"Query execution failed: {str(e)}")
+                if not self._transaction_depth:
+                    self._rollback()
+                raise
+
+    def execute_commit(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Execute a write and commit it, unless a transaction is already open."""
+        with self._write_lock:
+            cursor = self.execute(query, params)
+            if not self._transaction_depth:
+                self.connection.commit()
+        return cursor
+
+    @contextmanager
+    def transaction(self):
+        """Group writes so they are committed together, or rolled back on error.
+
+        Nested transactions join the outermost one. Other threads' statements
+        on this connection wait until the outermost one ends.
+        """
+        if not self.connection:
+            raise Exception("No database connection")
+
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        with self._write_lock:
+            if not self.connection.in_transaction:
+                self.connection.execute("BEGIN")
+            self._transaction_depth = 1
+            try:
+                yield self
+                self.connection.commit()
+            except Exception:
+                self._rollback()
+                raise
+            finally:
+                self._transaction_depth = 0
+
+    def row_cache(self, table: str) -> OrderedDict:
+        """The rows cached by id for a table, least recently used first."""
+        cache = self._row_caches.get(table)
+        if cache is None:
+            cache = self._row_caches[table] = OrderedDict()
+        return cache
+
+    def _rollback(self):
+        """Roll back the open transaction."""
+        self.rollback_count += 1
+        # Rows cached since the transaction began may have been rolled back
+        for cache in self._row_caches.values():
+            cache.clear()
+        self.connection.rollback()
 
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """Fetch a single row."""
-        cursor = self.execute(query, params)
-        return cursor.fetchone()
+        with self.reader() as connection:
+            cursor = self._execute_read(connection, query, params)
+            try:
+                return cursor.fetchone()
+            finally:
+                # Finish the statement so the reader doesn't hold on to its snapshot
+                cursor.close()
 
     def fetch_all(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Fetch all rows."""
-        cursor = self.execute(query, params)
-        return cursor.fetchall()
+        with self.reader() as connection:
+            return self._execute_read(connection, query, params).fetchall()
+
+    def _execute_read(self, connection: sqlite3.Connection, query: str, params: tuple) -> sqlite3.Cursor:
+        """Run a read query on the given connection."""
+        try:
+            return connection.execute(query, params)
+        except Exception as e:
+            self.logger.error(f"Query execution failed: {str(e)}")
+            raise
 
 class BaseRepository(Generic[T], ABC):
     """Base repository class for data access."""
 
+    # Most rows kept by the find_by_id cache
+    CACHE_SIZE = 1024
+
+    # Columns written by save besides id, in to_dict order. Repositories
+    # that declare them get their INSERT and UPDATE built up front instead
+    # of looked up from each entity's keys
+    COLUMNS = ()
+
     def __init__(self, db_connection: DatabaseConnection):
         self.db = db_connection
         self.logger = Logger(f"{self.__class__.__name__}")
 
+        # SQL is built once per repository rather than on every call
+        table = self.table_name()
+
+        # Rows by id, shared with every repository for the table on this
+        # connection. Rows are cached rather than entities so every caller
+        # gets its own entity to modify
+        self._cache = db_connection.row_cache(table)
+        self._sql_find_by_id = f"SELECT * FROM {table} WHERE id = ?"
+        self._sql_find_all = f"SELECT * FROM {table} LIMIT ? OFFSET ?"
+        self._sql_delete = f"DELETE FROM {table} WHERE id = ?"
+        self._sql_insert = {}  # column names -> INSERT statement
+        self._sql_update = {}  # column names -> UPDATE statement
+        if self.COLUMNS:
+            insert_columns = ('id',) + self.COLUMNS
+            self._sql_insert_row = self._insert_query(insert_columns)
+            self._insert_values = itemgetter(*insert_columns)
+            self._sql_update_row = self._update_query(self.COLUMNS)
+            self._update_values = itemgetter(*self.COLUMNS)
+
     @abstractmethod
     def table_name(self) -> str:
         """Return the table name for this repository."""
@@ -81,18 +411,24 @@ class BaseRepository(Generic[T], ABC):
 
     @abstractmethod
     def from_dict(self, data: Dict[str, Any]) -> T:
-        """Create entity from dictionary."""
+        """Create entity from dictionary.
+
+        data may also be a sqlite3.Row straight from the cursor, so it
+        should only be indexed by column name.
+        """
         pass
 
     def find_by_id(self, id: int) -> Optional[T]:
         """Find entity by ID."""
         try:
-            query = f"SELECT * FROM {self.table_name()} WHERE id = ?"
-            row = self.db.fetch_one(query, (id,))
-
-            if row:
-                return self.from_dict(dict(row))
-            return None
+            row = self._cached_row(id)
+            if row is None:
+                row = self.db.fetch_one(self._sql_find_by_id, (id,))
+                if not row:
+                    return None
+                self._cache_row(id, row)
+
+            return self.from_dict(row)
         except Exception as e:
             self.logger.error(f"Failed to find entity by ID: {str(e)}")
             return None
@@ -100,19 +436,37 @@ class BaseRepository(Generic[T], ABC):
     def find_all(self, limit: int = 100, offset: int = 0) -> List[T]:
         """Find all entities with pagination."""
         try:
-            query = f"SELECT * FROM {self.table_name()} LIMIT ? OFFSET ?"
-            rows = self.db.fetch_all(query, (limit, offset))
-
-            return [self.from_dict(dict(row)) for row in rows]
+            return list(self.iter_all(limit, offset))
         except Exception as e:
             self.logger.error(f"Failed to find all entities: {str(e)}")
             return []
 
+    def iter_all(self, limit: int = 100, offset: int = 0, batch_size: int = 500):
+        """Yield entities with pagination, fetching rows from the cursor in batches."""
+        from_dict = self.from_dict
+        with self.db.reader() as connection:
+            cursor = connection.execute(self._sql_find_all, (limit, offset))
+            cursor.arraysize = batch_size
+            try:
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        # from_dict only indexes by column name, which sqlite3.Row supports
+                        yield from_dict(row)
+            finally:
+                cursor.close()
+
     def save(self, entity: T) -> T:
-        """Save entity to database."""
+        """Save entity to database.
+
+        Inside db.transaction() the write is committed along with the rest
+        of the transaction instead of on its own.
+        """
         try:
             data = self.to_dict(entity)
-            data['updated_at'] = datetime.now().isoformat()
+            data['updated_at'] = _dump_timestamp(datetime.now())
 
             if hasattr(entity, 'id') and entity.id:
                 # Update existing
@@ -124,35 +478,125 @@ class BaseRepository(Generic[T], ABC):
             self.logger.error(f"Failed to save entity: {str(e)}")
             raise
 
-    def _create(self, data: Dict[str, Any]) -> T:
-        """Create new entity."""
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        values = tuple(data.values())
+    def bulk_create(self, entities: List[T]) -> int:
+        """Insert many new entities in a single transaction.
 
-        query = f"INSERT INTO {self.table_name()} ({columns}) VALUES ({placeholders})"
-        cursor = self.db.execute(query, values)
+        Returns the number of rows inserted. Unlike save, the created
+        entities are not read back.
+        """
+        updated_at = _dump_timestamp(datetime.now())
+        rows = []
+        for entity in entities:
+            data = self.to_dict(entity)
+            data['updated_at'] = updated_at
+            rows.append(data)
+        if not rows:
+            return 0
+
+        if self.COLUMNS:
+            query = self._sql_insert_row
+            params = map(self._insert_values, rows)
+        else:
+            columns = tuple(rows[0].keys())
+            query = self._insert_query(columns)
+            params = (tuple(row[column] for column in columns) for row in rows)
+
+        # One commit for the whole batch, or no rows at all if any insert fails
+        with self.db.transaction():
+            self.db.execute_many(query, params)
+        return len(rows)
 
-        # Get the created entity
-        created_id = cursor.lastrowid
-        return self.find_by_id(created_id)
+    def _create(self, data: Dict[str, Any]) -> T:
+        """Create new entity."""
+        if self.COLUMNS:
+            query = self._sql_insert_row
+            values = self._insert_values(data)
+        else:
+            query = self._insert_query(tuple(data.keys()))
+            values = tuple(data.values())
+        cursor = self.db.execute_commit(query + _RETURNING, values)
+
+        # The created row comes back from the INSERT itself, defaults and
+        # generated columns included; without RETURNING it is built from
+        # what was written rather than read back
+        if _RETURNING:
+            row = cursor.fetchone()
+            created_id = row['id']
+        else:
+            created_id = cursor.lastrowid
+            row = dict(data)
+            row['id'] = created_id
+        self._cache_row(created_id, row)
+        return self.from_dict(row)
 
     def _update(self, id: int, data: Dict[str, Any]) -> T:
         """Update existing entity."""
-        set_clause = ', '.join([f"{k} = ?" for k in data.keys() if k != 'id'])
-        values = tuple([v for k, v in data.items() if k != 'id'])
+        if self.COLUMNS:
+            query = self._sql_update_row
+            values = self._update_values(data)
+        else:
+            columns = tuple(k for k in data.keys() if k != 'id')
+            query = self._update_query(columns)
+            values = tuple([data[k] for k in columns])
         values += (id,)
-
-        query = f"UPDATE {self.table_name()} SET {set_clause} WHERE id = ?"
-        self.db.execute(query, values)
-
-        return self.find_by_id(id)
+        cursor = self.db.execute_commit(query + _RETURNING, values)
+
+        if _RETURNING:
+            row = cursor.fetchone()
+        elif cursor.rowcount:
+            row = dict(data)
+            row['id'] = id
+        else:
+            row = None
+
+        if row is None:
+            self.invalidate(id)
+            return None
+        self._cache_row(id, row)
+        return self.from_dict(row)
+
+    def invalidate(self, id: int = None):
+        """Drop a cached row, or every cached row, after writes made elsewhere."""
+        if id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(id, None)
+
+    def _cached_row(self, id: int) -> Optional[Dict[str, Any]]:
+        """Get a cached row, marking it as recently used."""
+        row = self._cache.get(id)
+        if row is not None:
+            self._cache.move_to_end(id)
+        return row
+
+    def _cache_row(self, id: int, row: Dict[str, Any]):
+        """Cache a row, evicting the least recently used one when full."""
+        self._cache[id] = row
+        self._cache.move_to_end(id)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _update_query(self, columns: tuple) -> str:
+        """Get the UPDATE statement for the given column names."""
+        query = self._sql_update.get(columns)
+        if query is None:
+            set_clause = ', '.join([f"{k} = ?" for k in columns])
+            query = self._sql_update[columns] = f"UPDATE {self.table_name()} SET {set_clause} WHERE id = ?"
+        return query
+
+    def _insert_query(self, columns: tuple) -> str:
+        """Get the INSERT statement for the given column names."""
+        query = self._sql_insert.get(columns)
+        if query is None:
+            placeholders = ', '.join(['?' for _ in columns])
+            query = self._sql_insert[columns] = f"INSERT INTO {self.table_name()} ({', '.join(columns)}) VALUES ({placeholders})"
+        return query
 
     def delete(self, id: int) -> bool:
         """Delete entity by ID."""
         try:
-            query = f"DELETE FROM {self.table_name()} WHERE id = ?"
-            self.db.execute(query, (id,))
+            self.db.execute_commit(self._sql_delete, (id,))
+            self.invalidate(id)
             self.logger.info(f"Deleted entity {id} from {self.table_name()}")
             return True
         except Exception as e:
@@ -162,6 +606,11 @@ class BaseRepository(Generic[T], ABC):
 class UserRepository(BaseRepository):
     """Repository for User entities."""
 
+    COLUMNS = (
+        'name', 'email', 'raw_data', 'is_active', 'role', 'preferences',
+        'last_login', 'created_at', 'updated_at'
+    )
+
     def table_name(self) -> str:
         return "users"
 
@@ -171,13 +620,13 @@ class UserRepository(BaseRepository):
             'id': user.id,
             'name': user.name,
             'email': user.email,
-            'raw_data': json.dumps(user.raw_data),
+            'raw_data': _dump_json(user.raw_data),
             'is_active': user.is_active,
             'role': user.role,
-            'preferences': json.dumps(user.preferences),
-            'last_login': user.last_login.isoformat() if user.last_login else None,
-            'created_at': user.created_at.isoformat(),
-            'updated_at': user.updated_at.isoformat()
+            'preferences': _dump_json(user.preferences),
+            'last_login': _dump_timestamp(user.last_login),
+            'created_at': _dump_timestamp(user.created_at),
+            'updated_at': _dump_timestamp(user.updated_at)
         }
 
     def from_dict(self, data: Dict[str, Any]):
@@ -188,30 +637,42 @@ class UserRepository(BaseRepository):
             id=data['id'],
             name=data['name'],
             email=data['email'],
-            raw_data=json.loads(data['raw_data']) if data['raw_data'] else {}
+            raw_data=_load_json(data['raw_data']) if data['raw_data'] else {}
         )
         user.is_active = data['is_active']
         user.role = data['role']
-        user.preferences = json.loads(data['preferences']) if data['preferences'] else {}
-        user.last_login = datetime.fromisoformat(data['last_login']) if data['last_login'] else None
-        user.created_at = datetime.fromisoformat(data['created_at'])
-        user.updated_at = datetime.fromisoformat(data['updated_at'])
+        user.preferences = _load_json(data['preferences']) if data['preferences'] else {}
+        user.last_login = _load_timestamp(data['last_login'])
+        user.created_at = _load_timestamp(data['created_at'])
+        user.updated_at = _load_timestamp(data['updated_at'])
 
         return user
 
     def find_by_email(self, email: str) -> Optional[Any]:
         """Find user by email."""
         try:
-            query = f"SELECT * FROM {self.table_name()} WHERE email = ?"
-            row = self.db.fetch_one(query, (email,))
+            row = self.db.fetch_one("SELECT * FROM users WHERE email = ?", (email,))
 
             if row:
-                return self.from_dict(dict(row))
+                return self.from_dict(row)
             return None
         except Exception as e:
             self.logger.error(f"Failed to find user by email: {str(e)}")
             return None
 
+    def find_by_sensor(self, sensor: str, limit: int = 100) -> List[Any]:
+        """Find users whose first data point came from the given sensor."""
+        try:
+            # primary_sensor is indexed and computed by SQLite, so raw_data
+            # is never decoded to match it
+            rows = self.db.fetch_all(
+                "SELECT * FROM users WHERE primary_sensor = ? LIMIT ?", (sensor, limit)
+            )
+            return [self.from_dict(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"Failed to find users by sensor: {str(e)}")
+            return []
+
 class ReportRepository(BaseRepository):
     """Repository for Report entities."""
 
@@ -224,11 +685,11 @@ class ReportRepository(BaseRepository):
             'id': report.id,
             'title': report.title,
             'user_id': report.user.id if report.user else None,
-            'data': json.dumps(report.data),
+            'data': _dump_json(report.data),
             'status': report.status,
             'file_path': report.file_path,
-            'created_at': report.created_at.isoformat(),
-            'generated_at': report.generated_at.isoformat() if report.generated_at else None
+            'created_at': _dump_timestamp(report.created_at),
+            'generated_at': _dump_timestamp(report.generated_at)
         }
 
     def from_dict(self, data: Dict[str, Any]):
@@ -246,18 +707,21 @@ class ReportRepository(BaseRepository):
             id=data['id'],
             title=data['title'],
             user=user,
-            data=json.loads(data['data']) if data['data'] else {}
+            data=_load_json(data['data']) if data['data'] else {}
         )
         report.status = data['status']
         report.file_path = data['file_path']
-        report.created_at = datetime.fromisoformat(data['created_at'])
-        report.generated_at = datetime.fromisoformat(data['generated_at']) if data['generated_at'] else None
+        report.created_at = _load_timestamp(data['created_at'])
+        report.generated_at = _load_timestamp(data['generated_at'])
 
         return report
 
 class DatabaseInitializer:
     """Database schema initializer."""
 
+    # Most values bound in a single IN (...) lookup
+    MAX_QUERY_PARAMS = 900
+
     def __init__(self, db_connection: DatabaseConnection):
         self.db = db_connection
         self.logger = Logger("DatabaseInitializer")
@@ -266,19 +730,26 @@ class DatabaseInitializer:
         """Initialize database schema."""
         self.logger.info("Initializing database schema")
 
+        with self.db.transaction():
+            self._create_tables()
+
+        self.logger.info("Database schema initialized successfully")
+
+    def _create_tables(self):
+        """Create the tables and indexes."""
         # Create users table
         self.db.execute('''
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 email TEXT UNIQUE NOT NULL,
-                raw_data TEXT,
+                raw_data BLOB,
                 is_active BOOLEAN DEFAULT 1,
                 role TEXT DEFAULT 'user',
-                preferences TEXT,
-                last_login TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
+                preferences BLOB,
+                last_login INTEGER,
+                created_at INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL
             )
         ''')
 
@@ -288,38 +759,99 @@ class DatabaseInitializer:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 title TEXT NOT NULL,
                 user_id INTEGER,
-                data TEXT,
+                data BLOB,
                 status TEXT DEFAULT 'pending',
                 file_path TEXT,
-                created_at TEXT NOT NULL,
-                generated_at TEXT,
+                created_at INTEGER NOT NULL,
+                generated_at INTEGER,
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
 
+        # Generated columns are added separately so existing tables get them too
+        self._add_generated_columns()
+
         # Create indexes
         self.db.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_users_primary_sensor ON users(primary_sensor)')
         self.db.execute('CREATE INDEX IF NOT EXISTS idx_reports_user_id ON reports(user_id)')
         self.db.execute('CREATE INDEX IF NOT EXISTS idx_reports_status ON reports(status)')
 
-        self.logger.info("Database schema initialized successfully")
+    def _add_generated_columns(self):
+        """Add any generated columns the tables don't have yet."""
+        for table, columns in GENERATED_COLUMNS.items():
+            # Read on the writing connection, which sees tables created in
+            # this transaction; table_xinfo also lists generated columns
+            existing = {row['name'] for row in self.db.execute(f"PRAGMA table_xinfo({table})")}
+            for column in columns:
+                if column[0] not in existing:
+                    self.db.execute(f"ALTER TABLE {table} ADD COLUMN {_generated_column_sql(*column)}")
+
+    def migrate_json_columns(self):
+        """Convert JSON columns stored as TEXT by older versions to BLOBs."""
+        self.logger.info("Migrating JSON columns to BLOB storage")
+
+        # SQLite keeps a value's storage class per row, so the BLOB values
+        # fit the existing column declarations without rebuilding the tables
+        with self.db.transaction():
+            for table, columns in JSON_COLUMNS.items():
+                for column in columns:
+                    self.db.execute(
+                        f"UPDATE {table} SET {column} = CAST({column} AS BLOB) WHERE typeof({column}) = 'text'"
+                    )
+
+        self.logger.info("JSON column migration completed")
+
+    def migrate_timestamp_columns(self):
+        """Convert ISO timestamp strings written by older versions to microseconds."""
+        self.logger.info("Migrating timestamp columns to integer storage")
+
+        with self.db.transaction():
+            for table, columns in TIMESTAMP_COLUMNS.items():
+                for column in columns:
+                    rows = self.db.fetch_all(
+                        f"SELECT id, {column} FROM {table} WHERE typeof({column}) = 'text' AND {column} GLOB '*-*'"
+                    )
+                    self.db.execute_many(
+                        f"UPDATE {table} SET {column} = ? WHERE id = ?",
+                        [(_dump_timestamp(datetime.fromisoformat(row[1])), row[0]) for row in rows]
+                    )
+
+        self.logger.info("Timestamp column migration completed")
 
     def seed_sample_data(self):
         """Seed database with sample data."""
         from data.sample_data import SAMPLE_USERS
 
+        from models.user import User
+
         user_repo = UserRepository(self.db)
 
+        # Look up which sample emails already exist in one query per chunk,
+        # kept under SQLite's default limit of 999 bound parameters
+        emails = [user_data['email'] for user_data in SAMPLE_USERS]
+        existing_emails = set()
+        for start in range(0, len(emails), self.MAX_QUERY_PARAMS):
+            chunk = emails[start:start + self.MAX_QUERY_PARAMS]
+            placeholders = ', '.join(['?' for _ in chunk])
+            rows = self.db.fetch_all(f"SELECT email FROM users WHERE email IN ({placeholders})", tuple(chunk))
+            existing_emails.update(row['email'] for row in rows)
+
+        users = []
         for user_data in SAMPLE_USERS:
+            if user_data['email'] in existing_emails:
+                continue
             try:
-                # Check if user already exists
-                existing = user_repo.find_by_email(user_data['email'])
-                if not existing:
-                    from models.user import User
-                    user = User(**user_data)
-                    user_repo.save(user)
-                    self.logger.info(f"Seeded user: {user.email}")
+                users.append(User(**user_data))
+                existing_emails.add(user_data['email'])
             except Exception as e:
                 self.logger.error(f"Failed to seed user {user_data['email']}: {str(e)}")
 
+        try:
+            user_repo.bulk_create(users)
+            for user in users:
+                self.logger.info(f"Seeded user: {user.email}")
+        except Exception as e:
+            self.logger.error(f"Failed to seed users: {str(e)}")
+
         self.logger.info("Sample data seeding completed")
\ No newline at end of file
@@ -10,12 +10,18 @@ from utils.formatters import DataFormatter
 class BaseModel:
     """Base class for all data models."""
 
+    # Slotted so DataPoint can be fully slotted; subclasses that don't
+    # declare __slots__ still get a __dict__
+    __slots__ = ('id', 'created_at', 'updated_at')
+
+    # Stateless helpers, shared by every model instance
+    validator = DataValidator()
+    formatter = DataFormatter()
+
     def __init__(self, id: int = None):
         self.id = id
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
-        self.validator = DataValidator()
-        self.formatter = DataFormatter()
 
     def validate(self) -> bool:
         """Validate the model data."""
@@ -101,12 +107,16 @@ class Report(BaseModel):
 class DataPoint(BaseModel):
     """Individual data point model."""
 
-    def __init__(self, id: int = None, value: Any = None, timestamp: datetime = None):
+    # Points are created in bulk, so they carry no per-instance __dict__
+    __slots__ = ('value', 'timestamp', 'quality_score', 'source')
+
+    def __init__(self, id: int = None, value: Any = None, timestamp: datetime = None,
+                 quality_score: float = 1.0, source: str = "unknown"):
         super().__init__(id)
         self.value = value
         self.timestamp = timestamp or datetime.now()
-        self.quality_score = 1.0
-        self.source = "unknown"
+        self.quality_score = quality_score
+        self.source = source
 
     def calculate_quality(self) -> float:
         """Calculate data quality score."""
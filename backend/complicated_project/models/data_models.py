@@ -2,79 +2,145 @@
 Data point and dataset models.
 """
 
+import csv
+import io
+from array import array
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from utils.formatters import DataFormatter
 
+_NUMERIC_TYPES = (int, float)
+
+# Stateless, shared by every point
+_formatter = DataFormatter()
+
+def _quality_of(value: Any) -> float:
+    """Calculate the quality score of a single data value."""
+    # Complex quality calculation logic
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return min(1.0, abs(value) / 100.0)
+    if isinstance(value, str):
+        return min(1.0, len(value) / 100.0)
+    return 0.5
+
+# eq=False keeps identity equality and hashing, as before it was a dataclass
+@dataclass(slots=True, eq=False)
 class DataPoint:
     """Individual data point model."""
 
-    def __init__(self, id: int = None, value: Any = None, timestamp: datetime = None):
-        self.id = id
-        self.value = value
-        self.timestamp = timestamp or datetime.now()
-        self.quality_score = 1.0
-        self.source = "unknown"
-        self.formatter = DataFormatter()
+    id: int = None
+    value: Any = None
+    timestamp: datetime = None
+    quality_score: float = 1.0
+    source: str = "unknown"
+
+    def __post_init__(self):
+        if self.timestamp is None:
+            self.timestamp = datetime.now()
 
     def calculate_quality(self) -> float:
         """Calculate data quality score."""
-        # Complex quality calculation logic
-        if self.value is None:
-            return 0.0
-        if isinstance(self.value, (int, float)):
-            return min(1.0, abs(self.value) / 100.0)
-        if isinstance(self.value, str):
-            return min(1.0, len(self.value) / 100.0)
-        return 0.5
+        return _quality_of(self.value)
 
     def normalize(self):
         """Normalize the data point."""
         self.quality_score = self.calculate_quality()
-        self.value = self.formatter.normalize_value(self.value)
+        self.value = _formatter.normalize_value(self.value)
 
     def to_csv_row(self) -> str:
         """Convert to CSV row format."""
         return f"{self.id},{self.timestamp.isoformat()},{self.value},{self.quality_score}"
 
 class Dataset:
-    """Dataset model containing multiple data points."""
+    """Dataset model containing multiple data points.
+
+    Points are stored column-wise, one list per DataPoint field with quality
+    scores packed into a float array, so passes over a single field don't
+    have to visit every point object. The columns are the source of truth:
+    change points through them or add_point.
+    """
 
     def __init__(self, id: int = None, name: str = "", points: List[DataPoint] = None):
         self.id = id
         self.name = name
-        self.points = points or []
-        self.total_points = len(self.points)
+        self.ids = []
+        self.values = []
+        self.timestamps = []
+        self.sources = []
+        self.quality_scores = array('d')
+        for point in points or []:
+            self._append_point(point)
+        self.total_points = len(self.values)
+        # Running sum of quality_scores, so adding a point doesn't re-sum them all
+        self._quality_total = sum(self.quality_scores)
         self.average_quality = 0.0
         self.created_at = datetime.now()
 
+    @property
+    def points(self) -> Tuple[DataPoint, ...]:
+        """A read-only snapshot of the points, rebuilt from the columns.
+
+        Each access builds every point anew, and changing the points it
+        returns doesn't change the dataset; use the columns instead.
+        """
+        return tuple(map(self._point_at, range(len(self.values))))
+
     def add_point(self, point: DataPoint):
         """Add a data point to the dataset."""
-        self.points.append(point)
-        self.total_points = len(self.points)
-        self.calculate_average_quality()
+        self._append_point(point)
+        self.total_points = len(self.values)
+        self._quality_total += point.quality_score
+        self.average_quality = self._quality_total / self.total_points
+
+    def normalize_points(self, scale_factor: float = 1.0):
+        """Normalize all points in place, scaling numeric values if requested."""
+        # Quality is scored on the values as they were before normalizing
+        self.recompute_qualities()
+
+        normalize_value = _formatter.normalize_value
+        values = self.values
+        scale = scale_factor != 1.0
+
+        for i, value in enumerate(values):
+            value = normalize_value(value)
+            if scale and isinstance(value, (int, float)):
+                value *= scale_factor
+            values[i] = value
+
+    def recompute_qualities(self):
+        """Recalculate the quality score of every point in one pass."""
+        # Plain ints and floats, the common case, are scored inline rather
+        # than through a call per value; everything else uses _quality_of
+        self.quality_scores = array('d', [
+            min(1.0, abs(value) / 100.0) if type(value) in _NUMERIC_TYPES else _quality_of(value)
+            for value in self.values
+        ])
+        self._quality_total = sum(self.quality_scores)
 
     def calculate_average_quality(self):
         """Calculate average quality of all points."""
-        if not self.points:
+        self._quality_total = sum(self.quality_scores)
+        if not self.quality_scores:
             self.average_quality = 0.0
             return
 
-        total_quality = sum(point.quality_score for point in self.points)
-        self.average_quality = total_quality / len(self.points)
+        self.average_quality = self._quality_total / len(self.quality_scores)
 
     def filter_by_quality(self, min_quality: float) -> List[DataPoint]:
         """Filter points by minimum quality score."""
-        return [point for point in self.points if point.quality_score >= min_quality]
+        return [self._point_at(i) for i, quality in enumerate(self.quality_scores) if quality >= min_quality]
 
     def get_statistics(self) -> Dict:
         """Get dataset statistics."""
-        if not self.points:
+        qualities = self.quality_scores
+        if not qualities:
             return {'count': 0, 'average_quality': 0.0}
 
-        qualities = [p.quality_score for p in self.points]
         return {
-            'count': len(self.points),
+            'count': len(qualities),
             'average_quality': sum(qualities) / len(qualities),
             'min_quality': min(qualities),
             'max_quality': max(qualities)
@@ -82,6 +148,27 @@ class Dataset:
 
     def export_to_csv(self) -> str:
         """Export dataset to CSV format."""
-        header = "id,timestamp,value,quality_score\n"
-        rows = [point.to_csv_row() for point in self.points]
-        return header + "\n".join(rows)
\ No newline at end of file
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['id', 'timestamp', 'value', 'quality_score'])
+        # Rows come straight from the columns, without building DataPoints
+        writer.writerows(zip(
+            self.ids,
+            [timestamp.isoformat() for timestamp in self.timestamps],
+            self.values,
+            self.quality_scores
+        ))
+        return buffer.getvalue()
+
+    def _append_point(self, point: DataPoint):
+        """Store a data point's fields in the columns."""
+        self.ids.append(point.id)
+        self.values.append(point.value)
+        self.timestamps.append(point.timestamp)
+        self.sources.append(point.source)
+        self.quality_scores.append(point.quality_score)
+
+    def _point_at(self, index: int) -> DataPoint:
+        """Build a DataPoint from the row at index."""
+        return DataPoint(self.ids[index], self.values[index], self.timestamps[index],
+                         self.quality_scores[index], self.sources[index])
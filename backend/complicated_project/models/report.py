@@ -10,6 +10,9 @@ from utils.formatters import DataFormatter
 class Report:
     """Report model for generated reports."""
 
+    # Stateless, shared by every report
+    formatter = DataFormatter()
+
     def __init__(self, id: int = None, title: str = "", user: User = None, data: Dict = None):
         self.id = id
         self.title = title
@@ -20,7 +23,6 @@ class Report:
         self.generated_at = None
         self.file_path = None
         self.metadata = {}
-        self.formatter = DataFormatter()
 
     def generate(self):
         """Generate the report."""
@@ -43,6 +45,10 @@ class Report:
             'generated_at': self.generated_at.isoformat() if self.generated_at else None
         }
 
+    def to_dict(self) -> Dict:
+        """Get the report data."""
+        return self.data
+
     def export_to_json(self) -> str:
         """Export report data to JSON."""
         return self.formatter.to_json(self.data)
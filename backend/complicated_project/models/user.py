@@ -10,12 +10,14 @@ from utils.formatters import DataFormatter
 class BaseModel:
     """Base class for all data models."""
 
+    # Stateless helpers, shared by every model instance
+    validator = DataValidator()
+    formatter = DataFormatter()
+
     def __init__(self, id: int = None):
         self.id = id
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
-        self.validator = DataValidator()
-        self.formatter = DataFormatter()
 
     def validate(self) -> bool:
         """Validate the model data."""
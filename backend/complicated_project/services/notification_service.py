@@ -2,53 +2,290 @@
 Notification service for sending alerts and messages.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+import hashlib
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import requests
 import json
 from models.user import User
 from utils.logger import Logger
-from utils.config_manager import ConfigManager
+from utils.config_manager import get_config_manager
 from utils.formatters import DataFormatter
 
+# Accent color of each notification type's emails
+_EMAIL_COLORS = {
+    'info': '#2196F3',
+    'warning': '#FF9800',
+    'error': '#F44336',
+    'success': '#4CAF50',
+    'report': '#9C27B0'
+}
+
+# Filled in with str.format, so the markup is built once rather than per email
+_EMAIL_TEMPLATE = """
+        <html>
+        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
+            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+                <h2 style="color: {color}; margin-top: 0;">Complex System Notification</h2>
+                <p><strong>Hello {name},</strong></p>
+                <div style="background: #f8f9fa; padding: 15px; border-left: 4px solid {color}; margin: 20px 0;">
+                    {message}
+                </div>
+                <p style="color: #666; font-size: 12px;">
+                    This is an automated message from Complex Data Processing System.<br>
+                    Timestamp: {timestamp}
+                </p>
+            </div>
+        </body>
+        </html>
+        """
+
+# Fields of a notification history record, in column order
+_HISTORY_FIELDS = ('user_id', 'user_email', 'message', 'type', 'success', 'timestamp')
+
+@lru_cache(maxsize=256)
+def _resolve_channels(notification_type: str, email_enabled: bool, sms_enabled: bool) -> Tuple[str, ...]:
+    """Channels for a notification type given a user's channel preferences.
+
+    Cached by its arguments, which cover everything the answer depends on,
+    so changed preferences simply look up a different entry.
+    """
+    channels = []
+
+    # Default channels based on type
+    if notification_type in ['error', 'alert']:
+        channels.extend(['email'])  # Critical notifications always go to email
+    elif notification_type == 'report':
+        channels.extend(['email'])
+    else:
+        channels.extend(['email'])  # Default to email
+
+    # Override with user preferences
+    if email_enabled:
+        if 'email' not in channels:
+            channels.append('email')
+
+    if sms_enabled:
+        channels.append('sms')
+
+    return tuple(channels)
+
 class NotificationService:
     """Service for handling various types of notifications."""
 
+    # Most SMTP sessions open at once, and messages sent on one before it is
+    # replaced, staying under providers' per-connection message limits
+    SMTP_POOL_SIZE = 5
+    SMTP_MAX_MESSAGES = 100
+
+    # Threads sending over the channels of multi-channel notifications
+    CHANNEL_WORKERS = 8
+
+    # Smallest bulk send that is abandoned when too many deliveries fail
+    BULK_ABORT_MIN_USERS = 30
+
+    # Notifications kept in the history
+    HISTORY_SIZE = 1000
+
+    # Most recently sent notifications remembered for duplicate checks
+    DEDUP_MAX_ENTRIES = 10000
+
     def __init__(self):
         self.logger = Logger("NotificationService")
-        self.config = ConfigManager()
+        self.config = get_config_manager()
         self.formatter = DataFormatter()
-        self.notification_history = []
+        self._load_settings()
+        # Last 1000 notifications, one column per field rather than a dict
+        # per notification; appending drops the oldest. The lock keeps the
+        # columns in step when several threads log at once
+        self._history_columns = tuple(deque(maxlen=self.HISTORY_SIZE) for _ in _HISTORY_FIELDS)
+        self._history_lock = threading.Lock()
+
+        # Idle SMTP sessions kept open across sends, as [session, messages
+        # sent] pairs. The semaphore caps the sessions in use at
+        # SMTP_POOL_SIZE, and a new one is only opened when none is idle,
+        # so no more than that many are ever open
+        self._idle_smtp = queue.LifoQueue()
+        self._smtp_slots = threading.BoundedSemaphore(self.SMTP_POOL_SIZE)
+
+        # HTTP session for the SMS API and webhooks, keeping connections to
+        # each host alive between requests instead of reconnecting per call
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=2)
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+
+        # Runs a notification's channel sends side by side
+        self._channel_executor = ThreadPoolExecutor(
+            max_workers=self.CHANNEL_WORKERS, thread_name_prefix="NotificationChannel"
+        )
+
+        # Notifications waiting to be delivered in the background, and the
+        # thread delivering them, started by the first send_notification
+        self._pending = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        # Expiry time by (user id, message digest, type) of notifications
+        # sent within the dedup window, oldest first, and the send times
+        # within the last minute for the rate limit
+        self._recent = OrderedDict()
+        self._send_times = deque()
+        self._throttle_lock = threading.Lock()
+
+    def reload_settings(self):
+        """Re-read the cached settings after the configuration changes."""
+        self._load_settings()
+
+    def _load_settings(self):
+        """Cache the settings used on every send, rather than looking them up each time."""
+        get = self.config.get
+        self._email_enabled = get('notifications.email_enabled', True)
+        self._sms_enabled = get('notifications.sms_enabled', False)
+        self._webhook_url = get('notifications.webhook_url')
+        self._bulk_workers = get('notifications.bulk_workers', 16)
+        self._dedup_window = get('notifications.dedup_window', 300)
+        self._rate_limit = get('notifications.rate_limit_per_minute')
+        self._smtp_server = get('email.smtp_server', 'smtp.gmail.com')
+        self._smtp_port = get('email.smtp_port', 587)
+        self._sender_email = get('email.sender', 'system@complexsystem.com')
+        self._sender_password = get('email.password', '')
+        self._sms_api_url = get('sms.api_url')
+        self._sms_api_key = get('sms.api_key')
 
     def send_notification(self, user: User, message: str, notification_type: str = "info") -> bool:
-        """Send a notification to a user."""
+        """Queue a notification to a user for background delivery.
+
+        Returns as soon as the notification is queued, so callers don't wait
+        on the network; the delivery outcome is recorded in the history.
+        Call flush() to wait for queued notifications to be delivered.
+
+        A notification identical to one queued for the same user within
+        notifications.dedup_window seconds is dropped, and reported as
+        sent, unless that one failed to be delivered. If notifications.rate_limit_per_minute is set (it is off by
+        default), notifications past that many sends in the last minute are
+        refused and False is returned.
+        """
+        key = (user.id, hashlib.blake2b(message.encode('utf-8'), digest_size=8).digest(), notification_type)
+        verdict = self._throttle(key)
+        if verdict == 'duplicate':
+            self.logger.info(f"Suppressed duplicate {notification_type} notification to user {user.id}")
+            return True
+        if verdict == 'rate_limited':
+            self.logger.warning(f"Rate limit reached, notification to user {user.id} not sent")
+            return False
+
+        self._ensure_worker()
+        self._pending.put((user, message, notification_type, key))
+        return True
+
+    def _throttle(self, key: tuple) -> Optional[str]:
+        """Check a notification against the dedup window and rate limit.
+
+        Returns 'duplicate' or 'rate_limited' if it shouldn't be sent,
+        otherwise records it as sent and returns None.
+        """
+        window = self._dedup_window
+        rate_limit = self._rate_limit
+        with self._throttle_lock:
+            now = time.monotonic()
+
+            # Entries expire in the order they were added
+            recent = self._recent
+            while recent:
+                oldest = next(iter(recent))
+                if recent[oldest] > now:
+                    break
+                del recent[oldest]
+            if key in recent:
+                return 'duplicate'
+
+            if rate_limit:
+                send_times = self._send_times
+                while send_times and send_times[0] <= now - 60:
+                    send_times.popleft()
+                if len(send_times) >= rate_limit:
+                    return 'rate_limited'
+                send_times.append(now)
+
+            recent[key] = now + window
+            if len(recent) > self.DEDUP_MAX_ENTRIES:
+                recent.popitem(last=False)
+        return None
+
+    def flush(self):
+        """Wait until every queued notification has been delivered."""
+        if self._worker is not None:
+            self._pending.join()
+
+    def _ensure_worker(self):
+        """Start the background delivery thread if it isn't running."""
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    worker = threading.Thread(
+                        target=self._deliver_pending, name="NotificationService", daemon=True
+                    )
+                    worker.start()
+                    self._worker = worker
+
+    def _deliver_pending(self):
+        """Deliver queued notifications, one at a time, forever."""
+        while True:
+            user, message, notification_type, key = self._pending.get()
+            try:
+                if not self._deliver_notification(user, message, notification_type):
+                    # Not delivered, so a retry of it isn't a duplicate
+                    with self._throttle_lock:
+                        self._recent.pop(key, None)
+            finally:
+                self._pending.task_done()
+
+    def _deliver_notification(self, user: User, message: str, notification_type: str = "info") -> bool:
+        """Send a notification to a user through its channels."""
         try:
             self.logger.info(f"Sending {notification_type} notification to user {user.id}")
 
             # Determine notification channels based on user preferences and config
             channels = self._get_notification_channels(user, notification_type)
 
-            success = False
+            # One clock reading stamps the email, webhook and history record
+            now = datetime.now()
+            timestamp = now.isoformat()
 
             # Send via configured channels
-            if 'email' in channels and self.config.get('notifications.email_enabled', True):
-                if self._send_email_notification(user, message, notification_type):
-                    success = True
-
-            if 'sms' in channels and self.config.get('notifications.sms_enabled', False):
-                if self._send_sms_notification(user, message):
-                    success = True
-
-            if 'webhook' in channels:
-                webhook_url = self.config.get('notifications.webhook_url')
-                if webhook_url and self._send_webhook_notification(user, message, notification_type):
-                    success = True
+            sends = []
+            if 'email' in channels and self._email_enabled:
+                sends.append(partial(
+                    self._send_email_notification, user, message, notification_type,
+                    now.strftime('%Y-%m-%d %H:%M:%S')
+                ))
+
+            if 'sms' in channels and self._sms_enabled:
+                sends.append(partial(self._send_sms_notification, user, message))
+
+            if 'webhook' in channels and self._webhook_url:
+                sends.append(partial(self._send_webhook_notification, user, message, notification_type, timestamp))
+
+            # Channels go to independent endpoints, so with more than one
+            # their sends run at once and the slowest sets the latency
+            if len(sends) > 1:
+                outcomes = list(self._channel_executor.map(lambda send: send(), sends))
+            else:
+                outcomes = [send() for send in sends]
+            success = any(outcomes)
 
             # Log notification
-            self._log_notification(user, message, notification_type, success)
+            self._log_notification(user, message, notification_type, success, timestamp)
 
             if success:
                 self.logger.info(f"Notification sent successfully to user {user.id}")
@@ -62,16 +299,51 @@ class NotificationService:
             return False
 
     def send_bulk_notification(self, users: List[User], message: str, notification_type: str = "info") -> Dict[str, int]:
-        """Send notification to multiple users."""
-        results = {'successful': 0, 'failed': 0}
+        """Send notification to multiple users.
+
+        Users are notified from a thread pool so their network waits
+        overlap rather than add up. Unlike send_notification this waits for
+        every delivery, so the counts are of actual outcomes, and it isn't
+        deduplicated or rate limited.
 
-        for user in users:
-            if self.send_notification(user, message, notification_type):
-                results['successful'] += 1
+        Batches of at least BULK_ABORT_MIN_USERS stop early once more than a
+        third of the users have failed, and more have failed than succeeded,
+        as when SMTP login is broken; the users not yet tried are counted
+        as skipped.
+        """
+        total = len(users)
+        results = {'successful': 0, 'failed': 0, 'skipped': 0}
+        results_lock = threading.Lock()
+        abort = threading.Event()
+
+        def deliver(user: User):
+            if abort.is_set():
+                outcome = 'skipped'
+            elif self._deliver_notification(user, message, notification_type):
+                outcome = 'successful'
             else:
-                results['failed'] += 1
+                outcome = 'failed'
+
+            with results_lock:
+                results[outcome] += 1
+                if (outcome == 'failed' and total >= self.BULK_ABORT_MIN_USERS and not abort.is_set()
+                        and results['failed'] * 3 > total and results['failed'] > results['successful']):
+                    self.logger.error("Aborting bulk notification: too many deliveries failed")
+                    abort.set()
+
+        workers = min(self._bulk_workers, total)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(deliver, users):
+                    pass
+        else:
+            for user in users:
+                deliver(user)
 
-        self.logger.info(f"Bulk notification completed: {results['successful']} successful, {results['failed']} failed")
+        self.logger.info(
+            f"Bulk notification completed: {results['successful']} successful, "
+            f"{results['failed']} failed, {results['skipped']} skipped"
+        )
         return results
 
     def send_system_alert(self, alert_message: str, severity: str = "warning"):
@@ -82,39 +354,22 @@ class NotificationService:
         # For now, just log it - in production this would notify admins
         return True
 
-    def _get_notification_channels(self, user: User, notification_type: str) -> List[str]:
+    def _get_notification_channels(self, user: User, notification_type: str) -> Tuple[str, ...]:
         """Determine which notification channels to use for a user."""
-        channels = []
-
         # Check user preferences
         preferences = user.preferences.get('notifications', {})
 
-        # Default channels based on type
-        if notification_type in ['error', 'alert']:
-            channels.extend(['email'])  # Critical notifications always go to email
-        elif notification_type == 'report':
-            channels.extend(['email'])
-        else:
-            channels.extend(['email'])  # Default to email
-
-        # Override with user preferences
-        if preferences.get('email_enabled', True):
-            if 'email' not in channels:
-                channels.append('email')
+        return _resolve_channels(
+            notification_type,
+            bool(preferences.get('email_enabled', True)),
+            bool(preferences.get('sms_enabled', False))
+        )
 
-        if preferences.get('sms_enabled', False):
-            channels.append('sms')
-
-        return channels
-
-    def _send_email_notification(self, user: User, message: str, notification_type: str) -> bool:
+    def _send_email_notification(self, user: User, message: str, notification_type: str,
+                                 display_time: Optional[str] = None) -> bool:
         """Send email notification."""
         try:
-            # Email configuration
-            smtp_server = self.config.get('email.smtp_server', 'smtp.gmail.com')
-            smtp_port = self.config.get('email.smtp_port', 587)
-            sender_email = self.config.get('email.sender', 'system@complexsystem.com')
-            sender_password = self.config.get('email.password', '')
+            sender_email = self._sender_email
 
             # Create message
             msg = MIMEMultipart()
@@ -123,15 +378,11 @@ class NotificationService:
             msg['Subject'] = f"Complex System - {notification_type.title()} Notification"
 
             # Email body
-            body = self._format_email_body(user, message, notification_type)
+            body = self._format_email_body(user, message, notification_type, display_time)
             msg.attach(MIMEText(body, 'html'))
 
             # Send email (commented out for demo - would need real SMTP setup)
-            # server = smtplib.SMTP(smtp_server, smtp_port)
-            # server.starttls()
-            # server.login(sender_email, sender_password)
-            # server.send_message(msg)
-            # server.quit()
+            # self._send_smtp_message(msg)
 
             self.logger.debug(f"Email notification sent to {user.email}")
             return True
@@ -140,12 +391,100 @@ class NotificationService:
             self.logger.error(f"Email sending failed: {str(e)}")
             return False
 
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open an SMTP session and log in."""
+        server = smtplib.SMTP(self._smtp_server, self._smtp_port)
+        try:
+            server.starttls()
+            server.login(self._sender_email, self._sender_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _acquire_smtp(self) -> list:
+        """Take an idle SMTP session, opening one if none is idle.
+
+        Blocks while SMTP_POOL_SIZE sessions are in use.
+        """
+        self._smtp_slots.acquire()
+        try:
+            return self._idle_smtp.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            return [self._connect_smtp(), 0]
+        except Exception:
+            self._smtp_slots.release()
+            raise
+
+    def _release_smtp(self, session: list, keep: bool = True):
+        """Return an SMTP session to the pool, or close it if keep is False."""
+        try:
+            if keep:
+                self._idle_smtp.put(session)
+            else:
+                self._quit_smtp(session[0])
+        finally:
+            self._smtp_slots.release()
+
+    def _quit_smtp(self, server: smtplib.SMTP):
+        """End an SMTP session, closing the socket even if QUIT fails."""
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            server.close()
+
+    def _send_smtp_message(self, msg: MIMEMultipart):
+        """Send a message over a pooled SMTP session.
+
+        The TCP, TLS and login handshakes are paid once per session rather
+        than once per message. A session the server has dropped is replaced
+        and the send retried once.
+        """
+        for attempt in range(2):
+            session = self._acquire_smtp()
+            server = session[0]
+            try:
+                if server.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected("SMTP session is no longer usable")
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._release_smtp(session, keep=False)
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                # e.g. a refused recipient; the session itself is still fine
+                self._release_smtp(session)
+                raise
+
+            session[1] += 1
+            self._release_smtp(session, keep=session[1] < self.SMTP_MAX_MESSAGES)
+            return
+
+    def close(self):
+        """Close the idle SMTP sessions, HTTP connections and channel threads.
+
+        Notifications still queued are delivered first.
+        """
+        self.flush()
+        self._channel_executor.shutdown(wait=True)
+        while True:
+            try:
+                server, _ = self._idle_smtp.get_nowait()
+            except queue.Empty:
+                break
+            self._quit_smtp(server)
+        self._http.close()
+
     def _send_sms_notification(self, user: User, message: str) -> bool:
         """Send SMS notification."""
         try:
             # SMS configuration
-            sms_api_url = self.config.get('sms.api_url')
-            sms_api_key = self.config.get('sms.api_key')
+            sms_api_url = self._sms_api_url
+            sms_api_key = self._sms_api_key
 
             if not sms_api_url or not sms_api_key:
                 self.logger.warning("SMS not configured")
@@ -163,7 +502,7 @@ class NotificationService:
                 'api_key': sms_api_key
             }
 
-            # response = requests.post(sms_api_url, json=payload)
+            # response = self._http.post(sms_api_url, json=payload, timeout=5)
             # return response.status_code == 200
 
             self.logger.debug(f"SMS notification sent to {phone_number}")
@@ -173,10 +512,11 @@ class NotificationService:
             self.logger.error(f"SMS sending failed: {str(e)}")
             return False
 
-    def _send_webhook_notification(self, user: User, message: str, notification_type: str) -> bool:
+    def _send_webhook_notification(self, user: User, message: str, notification_type: str,
+                                   timestamp: Optional[str] = None) -> bool:
         """Send webhook notification."""
         try:
-            webhook_url = self.config.get('notifications.webhook_url')
+            webhook_url = self._webhook_url
             if not webhook_url:
                 return False
 
@@ -185,10 +525,10 @@ class NotificationService:
                 'user_name': user.name,
                 'message': message,
                 'type': notification_type,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp or datetime.now().isoformat()
             }
 
-            # response = requests.post(webhook_url, json=payload)
+            # response = self._http.post(webhook_url, json=payload, timeout=5)
             # return response.status_code == 200
 
             self.logger.debug(f"Webhook notification sent to {webhook_url}")
@@ -198,73 +538,65 @@ class NotificationService:
             self.logger.error(f"Webhook sending failed: {str(e)}")
             return False
 
-    def _format_email_body(self, user: User, message: str, notification_type: str) -> str:
-        """Format email body as HTML."""
-        colors = {
-            'info': '#2196F3',
-            'warning': '#FF9800',
-            'error': '#F44336',
-            'success': '#4CAF50',
-            'report': '#9C27B0'
-        }
+    def _format_email_body(self, user: User, message: str, notification_type: str,
+                           display_time: Optional[str] = None) -> str:
+        """Format email body as HTML, stamped with display_time or else the current time."""
+        return _EMAIL_TEMPLATE.format(
+            color=_EMAIL_COLORS.get(notification_type, '#2196F3'),
+            name=user.get_display_name(),
+            message=message,
+            timestamp=display_time or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+    def _log_notification(self, user: User, message: str, notification_type: str, success: bool,
+                          timestamp: Optional[str] = None):
+        """Log notification for audit purposes."""
+        record = (user.id, user.email, message, notification_type, success,
+                  timestamp or datetime.now().isoformat())
 
-        color = colors.get(notification_type, '#2196F3')
+        with self._history_lock:
+            for column, value in zip(self._history_columns, record):
+                column.append(value)
 
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                <h2 style="color: {color}; margin-top: 0;">Complex System Notification</h2>
-                <p><strong>Hello {user.get_display_name()},</strong></p>
-                <div style="background: #f8f9fa; padding: 15px; border-left: 4px solid {color}; margin: 20px 0;">
-                    {message}
-                </div>
-                <p style="color: #666; font-size: 12px;">
-                    This is an automated message from Complex Data Processing System.<br>
-                    Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                </p>
-            </div>
-        </body>
-        </html>
-        """
+    @property
+    def notification_history(self) -> List[Dict]:
+        """Logged notifications as records, oldest first."""
+        return self._history_records(self._snapshot_history())
 
-    def _log_notification(self, user: User, message: str, notification_type: str, success: bool):
-        """Log notification for audit purposes."""
-        notification_record = {
-            'user_id': user.id,
-            'user_email': user.email,
-            'message': message,
-            'type': notification_type,
-            'success': success,
-            'timestamp': datetime.now().isoformat()
-        }
+    def _snapshot_history(self) -> Tuple[list, ...]:
+        """Copy the history columns as they stand."""
+        with self._history_lock:
+            return tuple(list(column) for column in self._history_columns)
 
-        self.notification_history.append(notification_record)
-
-        # Keep only last 1000 notifications
-        if len(self.notification_history) > 1000:
-            self.notification_history = self.notification_history[-1000:]
+    def _history_records(self, columns: Tuple[list, ...], rows: Optional[List[int]] = None) -> List[Dict]:
+        """Build history records from the columns, for all rows or the given ones."""
+        if rows is None:
+            return [dict(zip(_HISTORY_FIELDS, values)) for values in zip(*columns)]
+        return [{field: column[row] for field, column in zip(_HISTORY_FIELDS, columns)} for row in rows]
 
     def get_notification_history(self, user_id: Optional[int] = None, limit: int = 50) -> List[Dict]:
         """Get notification history."""
-        history = self.notification_history
+        columns = self._snapshot_history()
+        user_ids = columns[0]
+        rows = range(len(user_ids))
 
         if user_id:
-            history = [n for n in history if n['user_id'] == user_id]
+            rows = [row for row, row_user_id in enumerate(user_ids) if row_user_id == user_id]
 
-        return history[-limit:]
+        # Records are only built for the rows returned
+        return self._history_records(columns, list(rows[-limit:]))
 
     def get_notification_stats(self) -> Dict[str, Any]:
         """Get notification statistics."""
-        total = len(self.notification_history)
-        successful = sum(1 for n in self.notification_history if n['success'])
+        _, _, _, types, successes, _ = self._history_columns
+        with self._history_lock:
+            types = list(types)
+            successful = sum(successes)
+        total = len(types)
         failed = total - successful
 
         # Group by type
-        type_counts = {}
-        for notification in self.notification_history:
-            n_type = notification['type']
-            type_counts[n_type] = type_counts.get(n_type, 0) + 1
+        type_counts = dict(Counter(types))
 
         return {
             'total_notifications': total,
@@ -272,4 +604,4 @@ class NotificationService:
             'failed': failed,
             'success_rate': successful / total if total > 0 else 0,
             'by_type': type_counts
-        }
\ No newline at end of file
+        }
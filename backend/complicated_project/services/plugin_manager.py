@@ -6,24 +6,39 @@ This module demonstrates:
 2. Import aliases: import X as Y or from X import Y as Z
 """
 
+from functools import cache
+
 # Import alias examples
 from utils.logger import Logger as LogService
 from utils.validators import InputValidator as Validator
-from utils.config_manager import ConfigManager as CM
+from utils.config_manager import get_config_manager
 import json as json_lib
 
 from models.user import User
 from core.data_processor import DataProcessor as DP
 
+# Loggers and validators hold no per-plugin state, so plugin objects share
+# them rather than building their own. Each plugin still has its own
+# DataProcessor, which keeps processing stats.
+@cache
+def _logger(name: str) -> LogService:
+    """The logger shared by plugin objects of this name."""
+    return LogService(name)
+
+@cache
+def _validator() -> Validator:
+    """The validator shared by all plugin objects."""
+    return Validator()
+
 
 class PluginRegistry:
     """Registry that stores class references in instance attributes."""
     
     def __init__(self):
         # These are instance attribute assignments that should be tracked
-        self.log_handler = LogService("PluginRegistry")
-        self.validator = Validator()
-        self.config_handler = CM()
+        self.log_handler = _logger("PluginRegistry")
+        self.validator = _validator()
+        self.config_handler = get_config_manager()
         self.processor = DP()
     
     def register_plugin(self, plugin_name: str, plugin_data: dict):
@@ -55,7 +70,7 @@ class PluginLoader:
     
     def __init__(self):
         # Direct use of import aliases
-        self.logger = LogService("PluginLoader")
+        self.logger = _logger("PluginLoader")
     
     def load_plugins(self, plugin_path: str):
         """Load plugins from path."""
@@ -76,8 +91,8 @@ class PluginExecutor:
     
     def __init__(self):
         # Multiple instance attribute class assignments
-        self.log = LogService("PluginExecutor")
-        self.validation_service = Validator()
+        self.log = _logger("PluginExecutor")
+        self.validation_service = _validator()
         self.data_processor = DP()
     
     def execute(self, plugin_name: str, input_data: dict):
@@ -3,14 +3,17 @@ Report generation service.
 """
 
 from typing import Dict, List, Any, Optional
+from collections import Counter
 from datetime import datetime
+import csv
+import json
 import os
 from models.report import Report
 from models.user import User
 from models.data_models import Dataset
 from utils.logger import Logger
 from utils.formatters import ReportFormatter, CSVFormatter
-from utils.config_manager import ConfigManager
+from utils.config_manager import get_config_manager
 
 class ReportGenerator:
     """Service for generating various types of reports."""
@@ -19,9 +22,20 @@ class ReportGenerator:
         self.logger = Logger("ReportGenerator")
         self.formatter = ReportFormatter()
         self.csv_formatter = CSVFormatter()
-        self.config = ConfigManager()
+        self.config = get_config_manager()
         self.reports_dir = "reports"
 
+    @property
+    def reports_dir(self) -> str:
+        """Directory report files are saved in."""
+        return self._reports_dir
+
+    @reports_dir.setter
+    def reports_dir(self, path: str):
+        self._reports_dir = path
+        # Created by the first save, rather than checked on every one
+        self._reports_dir_ready = False
+
     def generate_report(self, user: User, processed_data: Dict) -> Report:
         """Generate a user-specific report."""
         try:
@@ -104,23 +118,32 @@ class ReportGenerator:
     def _compile_summary_data(self, reports: List[Report]) -> Dict[str, Any]:
         """Compile summary data from multiple reports."""
         total_reports = len(reports)
-        successful_reports = sum(1 for r in reports if r.status == 'completed')
-        failed_reports = total_reports - successful_reports
+        successful_reports = 0
 
-        # Calculate aggregate statistics
-        all_processing_times = []
-        all_qualities = []
+        # Aggregate statistics and per-report summaries, in a single pass
+        processing_time_total = 0
+        processing_time_count = 0
+        quality_total = 0
+        quality_count = 0
+        report_summaries = []
+        format_report_summary = self.formatter.format_report_summary
 
         for report in reports:
+            if report.status == 'completed':
+                successful_reports += 1
             if report.data and 'data_summary' in report.data:
                 summary = report.data['data_summary']
                 if 'processing_time' in summary:
-                    all_processing_times.append(summary['processing_time'])
+                    processing_time_total += summary['processing_time']
+                    processing_time_count += 1
                 if 'average_quality' in summary:
-                    all_qualities.append(summary['average_quality'])
+                    quality_total += summary['average_quality']
+                    quality_count += 1
+            report_summaries.append(format_report_summary(report))
 
-        avg_processing_time = sum(all_processing_times) / len(all_processing_times) if all_processing_times else 0
-        avg_quality = sum(all_qualities) / len(all_qualities) if all_qualities else 0
+        failed_reports = total_reports - successful_reports
+        avg_processing_time = processing_time_total / processing_time_count if processing_time_count else 0
+        avg_quality = quality_total / quality_count if quality_count else 0
 
         return {
             'summary': {
@@ -132,9 +155,9 @@ class ReportGenerator:
             'performance': {
                 'average_processing_time': avg_processing_time,
                 'average_data_quality': avg_quality,
-                'total_processing_time': sum(all_processing_times)
+                'total_processing_time': processing_time_total
             },
-            'reports': [self.formatter.format_report_summary(r) for r in reports],
+            'reports': report_summaries,
             'generated_at': datetime.now().isoformat()
         }
 
@@ -158,22 +181,20 @@ class ReportGenerator:
 
     def _prepare_chart_data(self, dataset: Dataset) -> Dict[str, Any]:
         """Prepare data for charts and visualizations."""
-        if not dataset or not dataset.points:
+        if not dataset or not dataset.values:
             return {}
 
-        # Prepare time series data
-        time_series = []
-        quality_over_time = []
-
-        for point in dataset.points[:50]:  # Limit to first 50 points for performance
-            time_series.append({
-                'timestamp': point.timestamp.isoformat(),
-                'value': point.value
-            })
-            quality_over_time.append({
-                'timestamp': point.timestamp.isoformat(),
-                'quality': point.quality_score
-            })
+        # Prepare time series data, limited to the first 50 points for
+        # performance, read from the dataset's columns
+        timestamps = [timestamp.isoformat() for timestamp in dataset.timestamps[:50]]
+        time_series = [
+            {'timestamp': timestamp, 'value': value}
+            for timestamp, value in zip(timestamps, dataset.values[:50])
+        ]
+        quality_over_time = [
+            {'timestamp': timestamp, 'quality': quality}
+            for timestamp, quality in zip(timestamps, dataset.quality_scores[:50])
+        ]
 
         return {
             'time_series': time_series,
@@ -183,24 +204,23 @@ class ReportGenerator:
 
     def _calculate_distribution(self, dataset: Dataset) -> Dict[str, int]:
         """Calculate value distribution for histogram."""
-        distribution = {}
-        for point in dataset.points:
-            if isinstance(point.value, (int, float)):
-                # Create bins
-                bin_value = round(point.value, 1)
-                distribution[str(bin_value)] = distribution.get(str(bin_value), 0) + 1
-
-        return distribution
+        # Bins are counted by their string label, so 1 and 1.0 stay apart,
+        # straight from the values column rather than rebuilt points
+        return dict(Counter(
+            str(round(value, 1)) for value in dataset.values if isinstance(value, (int, float))
+        ))
 
     def _save_report_file(self, report: Report):
         """Save report to file system."""
         try:
-            os.makedirs(self.reports_dir, exist_ok=True)
+            if not self._reports_dir_ready:
+                os.makedirs(self.reports_dir, exist_ok=True)
+                self._reports_dir_ready = True
 
             # Save as JSON
             json_file = os.path.join(self.reports_dir, f"{report.id}.json")
-            with open(json_file, 'w') as f:
-                f.write(report.export_to_json())
+            with open(json_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                self.formatter.write_json(report.to_dict(), f)
 
             # Save as CSV if applicable
             if report.data and 'charts_data' in report.data:
@@ -218,13 +238,12 @@ class ReportGenerator:
             charts_data = report.data.get('charts_data', {})
 
             if 'time_series' in charts_data:
-                with open(filename, 'w') as f:
-                    # Write header
-                    f.write("timestamp,value,quality\n")
-
-                    # Write data
-                    for point in charts_data['time_series']:
-                        f.write(f"{point['timestamp']},{point['value']},\n")
+                with open(filename, 'w', newline='', buffering=1 << 16) as f:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(('timestamp', 'value', 'quality'))
+                    writer.writerows(
+                        (point['timestamp'], point['value'], '') for point in charts_data['time_series']
+                    )
 
         except Exception as e:
             self.logger.error(f"Failed to save CSV report: {str(e)}")
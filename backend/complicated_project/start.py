@@ -5,22 +5,40 @@ This system processes user data, generates reports, and manages notifications.
 
 import sys
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from core.data_processor import DataProcessor
 from core.user_manager import UserManager
 from services.report_generator import ReportGenerator
 from services.notification_service import NotificationService
-from utils.logger import Logger
-from utils.config_manager import ConfigManager
+from utils.logger import Logger, log_to_queue, queue_log_listener
+from utils.config_manager import get_config_manager
 from models.user import User
 from models.report import Report
 
+# DataProcessor of a batch worker process, set up by _init_batch_worker
+_worker_processor = None
+
+def _init_batch_worker(log_queue):
+    """Set up a batch worker process's own data processor."""
+    global _worker_processor
+    # Logged through the parent process, the only one writing the log file
+    log_to_queue(log_queue)
+    _worker_processor = DataProcessor()
+    _worker_processor.initialize()
+
+def _process_raw_data(raw_data):
+    """Process one user's raw data in a batch worker process."""
+    # The parent process counts the result, through record_result
+    return _worker_processor.process(raw_data, record_stats=False)
+
 class Application:
     """Main application class that orchestrates all components."""
 
     def __init__(self):
         self.logger = Logger()
-        self.config = ConfigManager()
+        self.config = get_config_manager()
         self.data_processor = DataProcessor()
         self.user_manager = UserManager()
         self.report_generator = ReportGenerator()
@@ -32,6 +50,8 @@ class Application:
         self.config.load_config()
         self.data_processor.initialize()
         self.user_manager.initialize()
+        # The notification service shares the configuration just loaded
+        self.notification_service.reload_settings()
         self.logger.info("System initialization complete")
 
     def process_user_data(self, user_id: int):
@@ -43,6 +63,15 @@ class Application:
                 return None
 
             processed_data = self.data_processor.process(user.raw_data)
+            return self._finish_user_report(user, processed_data)
+
+        except Exception as e:
+            self.logger.error(f"Error processing user data: {str(e)}")
+            return None
+
+    def _finish_user_report(self, user: User, processed_data):
+        """Generate and announce the report for a user's processed data."""
+        try:
             report = self.report_generator.generate_report(user, processed_data)
 
             self.notification_service.send_notification(
@@ -50,7 +79,7 @@ class Application:
                 f"Your report is ready: {report.title}"
             )
 
-            self.logger.info(f"Successfully processed data for user {user_id}")
+            self.logger.info(f"Successfully processed data for user {user.id}")
             return report
 
         except Exception as e:
@@ -58,32 +87,64 @@ class Application:
             return None
 
     def run_batch_processing(self):
-        """Run batch processing for all active users."""
+        """Run batch processing for all active users.
+
+        Users' data is processed in parallel by a pool of worker processes,
+        processing.batch_workers of them (default: one per CPU); reports are
+        then generated here, in order, as results come back.
+        """
         active_users = self.user_manager.get_active_users()
         results = []
 
-        for user in active_users:
-            result = self.process_user_data(user.id)
-            if result:
-                results.append(result)
+        workers = self.config.get('processing.batch_workers')
+        if len(active_users) > 1 and workers != 1:
+            log_queue = multiprocessing.Queue()
+            log_listener = queue_log_listener(log_queue)
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                         initargs=(log_queue,)) as executor:
+                    payloads = executor.map(
+                        _process_raw_data, [user.raw_data for user in active_users], chunksize=4
+                    )
+                    for user, processed_data in zip(active_users, payloads):
+                        self.data_processor.record_result(processed_data)
+                        result = self._finish_user_report(user, processed_data)
+                        if result:
+                            results.append(result)
+            finally:
+                log_listener.stop()
+        else:
+            for user in active_users:
+                result = self.process_user_data(user.id)
+                if result:
+                    results.append(result)
 
         summary_report = self.report_generator.generate_summary_report(results)
         self.logger.info(f"Batch processing complete. Processed {len(results)} users")
         return summary_report
 
+    def shutdown(self):
+        """Deliver queued notifications and release connections and files."""
+        self.notification_service.close()
+        self.user_manager.close()
+        self.logger.info("System shutdown complete")
+
 def main():
     """Main entry point."""
     app = Application()
     app.initialize()
 
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "batch":
-            app.run_batch_processing()
-        elif sys.argv[1].isdigit():
-            user_id = int(sys.argv[1])
-            app.process_user_data(user_id)
-    else:
-        print("Usage: python start.py [user_id|batch]")
+    try:
+        if len(sys.argv) > 1:
+            if sys.argv[1] == "batch":
+                app.run_batch_processing()
+            elif sys.argv[1].isdigit():
+                user_id = int(sys.argv[1])
+                app.process_user_data(user_id)
+        else:
+            print("Usage: python start.py [user_id|batch]")
+    finally:
+        app.shutdown()
 
 if __name__ == "__main__":
     main()
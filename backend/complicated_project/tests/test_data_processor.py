@@ -2,19 +2,26 @@
 Unit tests for the data processor.
 """
 
+import copy
 import unittest
 from unittest.mock import Mock, patch
 from datetime import datetime
-from core.data_processor import DataProcessor
+from core.data_processor import DataProcessor, ProcessingStats
 from models.data_models import DataPoint, Dataset
 from utils.validators import DataValidator
 
 class TestDataProcessor(unittest.TestCase):
     """Test cases for DataProcessor class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build one processor for the class; each test gets a copy of it."""
+        cls._prototype = DataProcessor()
+
     def setUp(self):
         """Set up test fixtures."""
-        self.processor = DataProcessor()
+        self.processor = copy.copy(self._prototype)
+        self.processor.processing_stats = ProcessingStats()
         self.sample_data = {
             "user_id": 1,
             "data_points": [
@@ -89,6 +96,13 @@ class TestDataProcessor(unittest.TestCase):
         for key in required_keys:
             self.assertIn(key, stats)
 
+    def test_average_time_update(self):
+        """Test the average processing time tracks every recorded run."""
+        for processing_time in [0.5, 1.5, 2.5, 3.5]:
+            self.processor._update_processing_stats(True, processing_time)
+
+        self.assertAlmostEqual(self.processor.processing_stats['average_time'], 2.0)
+
     def test_reset_stats(self):
         """Test statistics reset."""
         # Process some data first
@@ -138,5 +152,18 @@ class TestDataPoint(unittest.TestCase):
         self.assertEqual(point.value, "test data")
         self.assertIsInstance(point.quality_score, float)
 
+class TestDataset(unittest.TestCase):
+    """Test cases for Dataset model."""
+
+    def test_recompute_qualities_matches_points(self):
+        """Test bulk quality recalculation agrees with per-point scores."""
+        values = [42.5, -250, "text", None, True, [1, 2]]
+        dataset = Dataset(points=[DataPoint(value=value) for value in values])
+
+        dataset.recompute_qualities()
+
+        expected = [DataPoint(value=value).calculate_quality() for value in values]
+        self.assertEqual(list(dataset.quality_scores), expected)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
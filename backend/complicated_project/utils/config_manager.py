@@ -4,9 +4,28 @@ Configuration management utility.
 
 import json
 import os
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from utils.logger import Logger
 
+# Parsed config files and their text, by (path, mtime, size), shared by every
+# ConfigManager so constructing many doesn't re-read and re-parse the file
+_CONFIG_CACHE: Dict[tuple, tuple] = {}
+
+def _copy_tree(value: Any) -> Any:
+    """Copy a parsed JSON value, so callers can't modify a cached one."""
+    if isinstance(value, dict):
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(v) for v in value]
+    return value
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> tuple:
+    """Split a dotted config key ("database.host") into its parts."""
+    return tuple(key.split('.'))
+
 class ConfigManager:
     """Configuration manager for the system."""
 
@@ -14,11 +33,18 @@ class ConfigManager:
         self.config_file = config_file
         self.config = {}
         self.logger = Logger("ConfigManager")
+        # Text of the config file as last read or written, so saving an
+        # unchanged config doesn't rewrite it
+        self._saved_text = None
+        # Open batch_updates() blocks, and whether they have unsaved changes
+        self._batch_depth = 0
+        self._dirty = False
         self.defaults = {
             "database": {
                 "host": "localhost",
                 "port": 5432,
-                "name": "complex_system_db"
+                "name": "complex_system_db",
+                "read_pool_size": 4
             },
             "logging": {
                 "level": "INFO",
@@ -28,12 +54,16 @@ class ConfigManager:
             "processing": {
                 "batch_size": 100,
                 "timeout": 300,
-                "max_retries": 3
+                "max_retries": 3,
+                "batch_workers": None  # worker processes for batch runs; None = one per CPU
             },
             "notifications": {
                 "email_enabled": True,
                 "sms_enabled": False,
-                "webhook_url": None
+                "webhook_url": None,
+                "bulk_workers": 16,
+                "dedup_window": 300,  # seconds
+                "rate_limit_per_minute": None  # sends per minute; None = no limit
             },
             "security": {
                 "session_timeout": 3600,
@@ -46,9 +76,8 @@ class ConfigManager:
         """Load configuration from file."""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
-                    self.config = self._merge_configs(self.defaults, loaded_config)
+                loaded_config = self._read_config_file()
+                self.config = self._merge_configs(self.defaults, loaded_config)
                 self.logger.info(f"Configuration loaded from {self.config_file}")
             else:
                 self.config = self.defaults.copy()
@@ -60,11 +89,37 @@ class ConfigManager:
             self.config = self.defaults.copy()
             return False
 
+    def _read_config_file(self) -> Dict[str, Any]:
+        """Parse the config file, reusing the cached parse if it hasn't changed."""
+        path = os.path.abspath(self.config_file)
+        with open(path, 'r') as f:
+            st = os.fstat(f.fileno())
+            key = (path, st.st_mtime_ns, st.st_size)
+            cached = _CONFIG_CACHE.get(key)
+            if cached is None:
+                text = f.read()
+                cached = (json.loads(text), text)
+                # Only the current version of each file is worth keeping
+                for stale in [k for k in _CONFIG_CACHE if k[0] == path]:
+                    del _CONFIG_CACHE[stale]
+                _CONFIG_CACHE[key] = cached
+
+        loaded_config, self._saved_text = cached
+        return _copy_tree(loaded_config)
+
     def save_config(self) -> bool:
-        """Save current configuration to file."""
+        """Save current configuration to file.
+
+        Nothing is written if the file already holds this configuration.
+        """
         try:
+            text = json.dumps(self.config, indent=2)
+            self._dirty = False
+            if text == self._saved_text:
+                return True
             with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+                f.write(text)
+            self._saved_text = text
             self.logger.info(f"Configuration saved to {self.config_file}")
             return True
         except Exception as e:
@@ -73,10 +128,9 @@ class ConfigManager:
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key."""
-        keys = key.split('.')
         value = self.config
 
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
@@ -85,17 +139,17 @@ class ConfigManager:
 
     def set(self, key: str, value: Any) -> bool:
         """Set configuration value."""
-        keys = key.split('.')
+        *parents, leaf = _split_key(key)
         config = self.config
 
         # Navigate to the parent of the target key
-        for k in keys[:-1]:
+        for k in parents:
             if k not in config:
                 config[k] = {}
             config = config[k]
 
-        config[keys[-1]] = value
-        return self.save_config()
+        config[leaf] = value
+        return self._config_changed()
 
     def get_section(self, section: str) -> Dict[str, Any]:
         """Get entire configuration section."""
@@ -107,11 +161,35 @@ class ConfigManager:
             self.config[section] = {}
 
         self.config[section].update(values)
-        return self.save_config()
+        return self._config_changed()
 
     def reset_to_defaults(self) -> bool:
         """Reset configuration to defaults."""
         self.config = self.defaults.copy()
+        return self._config_changed()
+
+    @contextmanager
+    def batch_updates(self):
+        """Group changes so they are saved once, when the outermost block exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self) -> bool:
+        """Save changes deferred by batch_updates(), if there are any."""
+        if self._dirty:
+            return self.save_config()
+        return True
+
+    def _config_changed(self) -> bool:
+        """Save a change now, or when the enclosing batch_updates() block exits."""
+        if self._batch_depth:
+            self._dirty = True
+            return True
         return self.save_config()
 
     def validate_config(self) -> List[str]:
@@ -146,6 +224,15 @@ class ConfigManager:
 
         return result
 
+@lru_cache(maxsize=None)
+def get_config_manager(config_file: str = "config.json") -> ConfigManager:
+    """The ConfigManager shared by every subsystem using config_file.
+
+    It isn't loaded here: the application loads it once at startup, and the
+    subsystems holding it all see the loaded settings.
+    """
+    return ConfigManager(config_file)
+
 class EnvironmentConfigManager(ConfigManager):
     """Configuration manager that reads from environment variables."""
 
@@ -155,10 +242,13 @@ class EnvironmentConfigManager(ConfigManager):
 
     def load_from_env(self):
         """Load configuration from environment variables."""
-        for key in os.environ:
-            if key.startswith(self.env_prefix):
-                config_key = key[len(self.env_prefix):].lower().replace('_', '.')
-                value = os.environ[key]
+        # Saved once for all the variables rather than once per variable
+        prefix = self.env_prefix
+        variables = [(key, value) for key, value in os.environ.items() if key.startswith(prefix)]
+
+        with self.batch_updates():
+            for key, value in variables:
+                config_key = key[len(prefix):].lower().replace('_', '.')
 
                 # Try to parse as JSON, otherwise keep as string
                 try:
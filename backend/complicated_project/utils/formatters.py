@@ -2,10 +2,58 @@
 Data formatting utilities.
 """
 
+import csv
+import io
 import json
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, IO
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional, the stdlib json module is used without it
+    orjson = None
+
+def _json_default(obj):
+    """Encode the values json can't, for to_json and write_json."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+# Public, non-callable class attributes by class, for model_to_dict
+_CLASS_ATTRS: Dict[type, frozenset] = {}
+
+def _class_attrs(cls: type) -> frozenset:
+    """Names model_to_dict picks up from a model's class, computed once per class."""
+    names = _CLASS_ATTRS.get(cls)
+    if names is None:
+        names = _CLASS_ATTRS[cls] = frozenset(
+            attr for attr in dir(cls)
+            if not attr.startswith('_') and not callable(getattr(cls, attr, None))
+        )
+    return names
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+@lru_cache(maxsize=1024)
+def _format_size(size_bytes: float) -> str:
+    """Format a byte count with the largest unit that keeps it at or above 1."""
+    # Each unit is 2**10 times the last, so the unit follows from the bit length
+    whole = int(size_bytes)
+    unit = min((whole.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if whole > 0 else 0
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
+
+# Single-line JSON for log messages. Without indent the stdlib encoder takes
+# its C fast path; orjson also encodes datetimes itself.
+if orjson is not None:
+    def _dumps_compact(data: Any) -> str:
+        """Encode data as single-line JSON."""
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+else:
+    _dumps_compact = json.JSONEncoder(
+        ensure_ascii=False, separators=(',', ':'), default=_json_default
+    ).encode
+
 class DataFormatter:
     """Utility class for data formatting."""
 
@@ -32,40 +80,49 @@ class DataFormatter:
 
     def model_to_dict(self, model) -> Dict[str, Any]:
         """Convert model instance to dictionary."""
+        # Same attributes, in the same order, as filtering dir(model), without
+        # walking the whole class hierarchy on every call
+        names = _class_attrs(type(model))
+        instance_attrs = getattr(model, '__dict__', None)
+        if instance_attrs:
+            names = names.union(attr for attr in instance_attrs if not attr.startswith('_'))
+
         result = {}
-        for attr in dir(model):
-            if not attr.startswith('_') and not callable(getattr(model, attr)):
-                value = getattr(model, attr)
-                if isinstance(value, datetime):
-                    result[attr] = self.format_date(value)
-                else:
-                    result[attr] = value
+        for attr in sorted(names):
+            value = getattr(model, attr)
+            if callable(value):
+                continue
+            if isinstance(value, datetime):
+                result[attr] = self.format_date(value)
+            else:
+                result[attr] = value
         return result
 
-    def to_json(self, data: Any) -> str:
-        """Convert data to JSON string."""
-        def json_serializer(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+    def to_json(self, data: Any, compact: bool = False) -> str:
+        """Convert data to JSON string, indented unless compact."""
+        if compact:
+            return _dumps_compact(data)
+        return json.dumps(data, indent=2, default=_json_default)
+
+    def to_log_json(self, data: Any) -> str:
+        """Convert data to a compact, single-line JSON string for log messages."""
+        return self.to_json(data, compact=True)
 
-        return json.dumps(data, indent=2, default=json_serializer)
+    def write_json(self, data: Any, file: IO[str]):
+        """Write data to a file as compact JSON, without building the whole string first."""
+        json.dump(data, file, ensure_ascii=False, separators=(',', ':'), default=_json_default)
 
     def format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return ".1f"
-            size_bytes /= 1024.0
-        return ".1f"
+        return _format_size(size_bytes)
 
     def format_percentage(self, value: float) -> str:
-        """Format value as percentage."""
-        return ".1f"
+        """Format a fraction (0.25) as a percentage (25.0%)."""
+        return f"{value * 100:.1f}%"
 
     def format_currency(self, amount: float, currency: str = "USD") -> str:
         """Format amount as currency."""
-        return ".2f"
+        return f"{amount:,.2f} {currency}"
 
 class ReportFormatter(DataFormatter):
     """Specialized formatter for reports."""
@@ -93,17 +150,28 @@ class ReportFormatter(DataFormatter):
 class CSVFormatter(DataFormatter):
     """Formatter for CSV data."""
 
+    def __init__(self):
+        super().__init__()
+        # Reused for every formatted line, rather than set up per call
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator='\n')
+
     def format_row(self, data: Dict) -> str:
-        """Format dictionary as CSV row."""
-        values = []
-        for value in data.values():
-            if isinstance(value, str):
-                # Escape quotes and wrap in quotes if contains comma
-                if ',' in value or '"' in value:
-                    value = f'"{value.replace("""", """"")}"'
-            values.append(str(value))
-        return ','.join(values)
+        """Format dictionary values as a CSV row, quoting them as needed."""
+        return self._format_line(data.values())
 
     def format_header(self, data: Dict) -> str:
         """Format dictionary keys as CSV header."""
-        return ','.join(str(key) for key in data.keys())
\ No newline at end of file
+        return self._format_line(data.keys())
+
+    def write_rows(self, file: IO[str], rows: List[Dict]):
+        """Write each dictionary's values as a CSV row straight to a file."""
+        csv.writer(file, lineterminator='\n').writerows(row.values() for row in rows)
+
+    def _format_line(self, values) -> str:
+        """Format values as one CSV line, without the line ending."""
+        buffer = self._buffer
+        buffer.seek(0)
+        buffer.truncate()
+        self._writer.writerow(values)
+        return buffer.getvalue()[:-1]
@@ -3,11 +3,78 @@ Logging utility for the system.
 """
 
 import logging
+import logging.handlers
 import os
+import threading
 from datetime import datetime
 from typing import Dict, Any
 from utils.formatters import DataFormatter
 
+# Log file rotation, matching the "logging" defaults in ConfigManager (which
+# can't be read here, as ConfigManager itself logs through Logger)
+LOG_MAX_FILE_SIZE = 10485760  # 10MB
+LOG_BACKUP_COUNT = 5
+
+_shared_handlers = None
+_handlers_lock = threading.Lock()
+
+def _get_shared_handlers() -> tuple:
+    """The console and file handlers every Logger writes to, created on first use."""
+    global _shared_handlers
+    with _handlers_lock:
+        if _shared_handlers is None:
+            # Console handler
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            ))
+
+            # File handler; the file isn't opened until something is logged
+            log_dir = "logs"
+            os.makedirs(log_dir, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                f"{log_dir}/system_{datetime.now().strftime('%Y%m%d')}.log",
+                maxBytes=LOG_MAX_FILE_SIZE,
+                backupCount=LOG_BACKUP_COUNT,
+                delay=True
+            )
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+            ))
+
+            _shared_handlers = (console_handler, file_handler)
+    return _shared_handlers
+
+def queue_log_listener(log_queue) -> logging.handlers.QueueListener:
+    """Start writing the records other processes put on log_queue to this process's handlers.
+
+    Pairs with log_to_queue in those processes, so only this one writes to,
+    and rotates, the log file. Stop the listener once they are done.
+    """
+    listener = logging.handlers.QueueListener(log_queue, *_get_shared_handlers(), respect_handler_level=True)
+    listener.start()
+    return listener
+
+def log_to_queue(log_queue):
+    """Send this process's log records to log_queue rather than the log file.
+
+    For worker processes, which would otherwise rotate the parent's log file
+    from under it; loggers already set up, as inherited over fork, switch too.
+    """
+    global _shared_handlers
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    with _handlers_lock:
+        old_handlers = _shared_handlers or ()
+        _shared_handlers = (queue_handler,)
+
+    for logger in logging.Logger.manager.loggerDict.values():
+        if isinstance(logger, logging.Logger) and any(h in old_handlers for h in logger.handlers):
+            for handler in old_handlers:
+                logger.removeHandler(handler)
+            logger.addHandler(queue_handler)
+
 class Logger:
     """Centralized logging utility."""
 
@@ -22,29 +89,10 @@ class Logger:
         """Setup logger configuration."""
         self.logger.setLevel(logging.INFO)
 
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
-
-        # File handler
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-
-        file_handler = logging.FileHandler(
-            f"{log_dir}/system_{datetime.now().strftime('%Y%m%d')}.log"
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        )
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        # Handlers are shared by every logger, so only the first one sets
+        # them up and opens the log file
+        for handler in _get_shared_handlers():
+            self.logger.addHandler(handler)
 
     def info(self, message: str, extra: Dict[str, Any] = None):
         """Log info message."""
@@ -64,13 +112,18 @@ class Logger:
 
     def log_performance(self, operation: str, duration: float):
         """Log performance metrics."""
-        self.info(f"Performance: {operation} took {duration:.2f}s")
+        # Skip building the message when INFO is filtered out
+        if self.logger.isEnabledFor(logging.INFO):
+            self.info(f"Performance: {operation} took {duration:.2f}s")
 
     def log_user_action(self, user_id: int, action: str, details: Dict = None):
         """Log user actions."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         message = f"User {user_id} performed: {action}"
         if details:
-            message += f" - {self.formatter.to_json(details)}"
+            message += f" - {self.formatter.to_log_json(details)}"
         self.info(message)
 
 class AuditLogger(Logger):
@@ -79,6 +132,9 @@ class AuditLogger(Logger):
     def __init__(self):
         super().__init__("AuditLogger")
         self.audit_file = f"logs/audit_{datetime.now().strftime('%Y%m%d')}.log"
+        # Opened on the first event and kept open; line buffered, so each
+        # event still reaches the file as soon as it is logged
+        self._audit_fh = None
 
     def log_security_event(self, event: str, user_id: int = None, details: Dict = None):
         """Log security-related events."""
@@ -86,15 +142,21 @@ class AuditLogger(Logger):
         if user_id:
             message += f" - User: {user_id}"
         if details:
-            message += f" - {self.formatter.to_json(details)}"
+            message += f" - {self.formatter.to_log_json(details)}"
 
         # Write to audit log
-        with open(self.audit_file, 'a') as f:
-            timestamp = datetime.now().isoformat()
-            f.write(f"{timestamp} - {message}\n")
+        if self._audit_fh is None:
+            self._audit_fh = open(self.audit_file, 'a', buffering=1)
+        self._audit_fh.write(f"{datetime.now().isoformat()} - {message}\n")
 
         self.logger.warning(message)
 
+    def close(self):
+        """Close the audit log file."""
+        if self._audit_fh is not None:
+            self._audit_fh.close()
+            self._audit_fh = None
+
     def log_data_access(self, user_id: int, resource: str, action: str):
         """Log data access events."""
         self.log_security_event(
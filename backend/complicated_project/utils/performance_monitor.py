@@ -2,25 +2,153 @@
 Performance monitoring utility.
 """
 
+import csv
+import io
+import operator
+import os
 import time
 import psutil
 import threading
+from array import array
+from bisect import bisect_right
+from itertools import islice, takewhile
 from typing import Dict, List, Any, Callable, Optional
 from collections import deque
 from datetime import datetime, timedelta
 from utils.logger import Logger
-from utils.config_manager import ConfigManager
+from utils.config_manager import get_config_manager
+from utils.formatters import DataFormatter
+
+def _memory_usage() -> tuple:
+    """Memory use as (percent, used bytes), computed the way psutil does.
+
+    Read straight from /proc/meminfo where there is one, psutil otherwise.
+    """
+    try:
+        with open('/proc/meminfo', 'rb') as f:
+            # Values are in kB
+            info = {line.split(b':', 1)[0]: int(line.split()[1]) * 1024 for line in f}
+    except OSError:
+        memory = psutil.virtual_memory()
+        return memory.percent, memory.used
+
+    total = info[b'MemTotal']
+    used = total - info.get(b'MemAvailable', info[b'MemFree'])
+    return round(used / total * 100, 1), used
+
+def _disk_usage(path: str) -> tuple:
+    """Disk use of the filesystem holding path, as (percent, free bytes)."""
+    if not hasattr(os, 'statvfs'):
+        disk = psutil.disk_usage(path)
+        return disk.percent, disk.free
+
+    st = os.statvfs(path)
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    total_user = used + free
+    return (round(used / total_user * 100, 1) if total_user else 0.0), free
+
+def _network_io() -> tuple:
+    """Bytes sent and received over all interfaces, as (sent, received).
+
+    Read straight from /proc/net/dev where there is one, psutil otherwise.
+    """
+    try:
+        with open('/proc/net/dev', 'rb') as f:
+            lines = f.readlines()[2:]  # Skip the two header lines
+    except OSError:
+        net_io = psutil.net_io_counters()
+        return net_io.bytes_sent, net_io.bytes_recv
+
+    sent = received = 0
+    for line in lines:
+        fields = line.split(b':', 1)[1].split()
+        received += int(fields[0])
+        sent += int(fields[8])
+    return sent, received
+
+# Comparisons for the threshold types that raise alerts, by type; a threshold
+# is violated when compare(value, threshold value) is true
+_THRESHOLD_VIOLATIONS = {
+    'max': operator.gt,
+    'min': operator.lt,
+}
+
+class _MetricSamples:
+    """Ring buffer of a metric's latest samples.
+
+    Values and their time.time() timestamps are kept in two parallel float
+    arrays, so recording a sample allocates nothing and the statistics are
+    computed over array slices rather than per-sample dicts.
+    """
+
+    __slots__ = ('values', 'times', 'start', 'count')
+
+    def __init__(self, size: int = 1000):
+        self.values = array('d', bytes(8 * size))
+        self.times = array('d', bytes(8 * size))
+        self.start = 0  # index of the oldest sample
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: float, timestamp: float):
+        """Add a sample, overwriting the oldest one when full."""
+        size = len(self.values)
+        if self.count < size:
+            i = self.count
+            self.count += 1
+        else:
+            i = self.start
+            self.start = (i + 1) % size
+        self.values[i] = value
+        self.times[i] = timestamp
+
+    def last(self) -> tuple:
+        """The newest sample, as (value, timestamp)."""
+        i = (self.start + self.count - 1) % len(self.values)
+        return self.values[i], self.times[i]
+
+    def window(self, since: float = None) -> List[array]:
+        """Values recorded after since (all of them if None), oldest first.
+
+        Returned as one or two array slices, as the window may wrap around
+        the end of the buffer.
+        """
+        values, times, start = self.values, self.times, self.start
+        size = len(values)
+
+        first = 0
+        if since is not None:
+            first = bisect_right(range(self.count), since, key=lambda k: times[(start + k) % size])
+
+        begin, end = start + first, start + self.count
+        if begin >= size:
+            return [values[begin - size:end - size]]
+        if end <= size:
+            return [values[begin:end]]
+        return [values[begin:], values[:end - size]]
 
 class PerformanceMonitor:
     """Monitor system and application performance."""
 
     def __init__(self):
         self.logger = Logger("PerformanceMonitor")
-        self.config = ConfigManager()
+        self.config = get_config_manager()
         self.metrics = {}
-        self.alerts = []
+        # Keep only last 1000 alerts; their timestamps are time.time() values
+        # until get_alerts hands them out
+        self.alerts = deque(maxlen=1000)
         self.is_monitoring = False
         self.monitor_thread = None
+        # Guards self.metrics, the sample buffers and self.alerts, which the
+        # monitor thread and every timed function record into
+        self._metrics_lock = threading.Lock()
+
+        # Start psutil's CPU time baseline, so each collection can read usage
+        # since the previous one instead of blocking to measure it
+        psutil.cpu_percent(interval=None)
 
     def start_monitoring(self):
         """Start performance monitoring."""
@@ -58,84 +186,109 @@ class PerformanceMonitor:
             return wrapper
         return decorator
 
-    def record_metric(self, name: str, value: float, metric_type: str = "gauge", tags: Dict[str, str] = None):
-        """Record a performance metric."""
-        if name not in self.metrics:
-            self.metrics[name] = {
-                'type': metric_type,
-                'values': deque(maxlen=1000),  # Keep last 1000 values
-                'tags': tags or {},
-                'last_updated': None
-            }
-
-        metric = self.metrics[name]
-        metric['values'].append({
-            'value': value,
-            'timestamp': datetime.now()
-        })
-        metric['last_updated'] = datetime.now()
+    def record_metric(self, name: str, value: float, metric_type: str = "gauge", tags: Dict[str, str] = None,
+                      timestamp: float = None):
+        """Record a performance metric, taken at timestamp (time.time()) or now."""
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._metrics_lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = self._new_metric(name, metric_type, tags)
+            metric['values'].append(value, timestamp)
 
         # Check thresholds and generate alerts
-        self._check_thresholds(name, value)
+        if metric['threshold_checks']:
+            self._check_thresholds(name, value, timestamp)
 
     def get_metric(self, name: str, time_range: timedelta = None) -> Dict[str, Any]:
         """Get metric data."""
-        if name not in self.metrics:
+        metric = self.metrics.get(name)
+        if metric is None:
             return None
 
-        metric = self.metrics[name]
-        values = list(metric['values'])
-
-        if time_range:
-            cutoff = datetime.now() - time_range
-            values = [v for v in values if v['timestamp'] > cutoff]
+        cutoff = time.time() - time_range.total_seconds() if time_range else None
+        with self._metrics_lock:
+            samples = metric['values']
+            segments = [segment for segment in samples.window(cutoff) if segment]
+            if not segments:
+                return None
+            current, last_updated = samples.last()
 
-        if not values:
-            return None
-
-        numeric_values = [v['value'] for v in values]
+        count = sum(len(segment) for segment in segments)
 
         return {
             'name': name,
             'type': metric['type'],
-            'count': len(values),
-            'current': values[-1]['value'] if values else None,
-            'min': min(numeric_values) if numeric_values else None,
-            'max': max(numeric_values) if numeric_values else None,
-            'avg': sum(numeric_values) / len(numeric_values) if numeric_values else None,
+            'count': count,
+            'current': current,
+            'min': min(min(segment) for segment in segments),
+            'max': max(max(segment) for segment in segments),
+            'avg': sum(sum(segment) for segment in segments) / count,
             'tags': metric['tags'],
-            'last_updated': metric['last_updated']
+            'last_updated': datetime.fromtimestamp(last_updated)
         }
 
     def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
         """Get all metrics."""
-        return {name: self.get_metric(name) for name in self.metrics.keys()}
+        return {name: self.get_metric(name) for name in list(self.metrics)}
+
+    def iter_current(self):
+        """Yield (Prometheus name, type, current value) for each metric with samples."""
+        with self._metrics_lock:
+            current = [
+                (metric['prometheus_name'], metric['type'], metric['values'].last()[0])
+                for metric in self.metrics.values() if metric['values']
+            ]
+        yield from current
 
     def set_threshold(self, metric_name: str, threshold_type: str, value: float, alert_level: str = "warning"):
         """Set performance threshold for alerting."""
-        if metric_name not in self.metrics:
-            self.metrics[metric_name] = {
-                'type': 'gauge',
-                'values': deque(maxlen=1000),
-                'tags': {},
-                'last_updated': None
-            }
-
-        metric = self.metrics[metric_name]
-        if 'thresholds' not in metric:
-            metric['thresholds'] = []
-
-        metric['thresholds'].append({
+        threshold = {
             'type': threshold_type,  # 'min', 'max', 'avg'
             'value': value,
             'alert_level': alert_level
-        })
+        }
+        # Resolved here once, rather than per recorded value
+        violated = _THRESHOLD_VIOLATIONS.get(threshold_type)
+
+        with self._metrics_lock:
+            if metric_name not in self.metrics:
+                self.metrics[metric_name] = self._new_metric(metric_name, 'gauge')
+
+            metric = self.metrics[metric_name]
+            if 'thresholds' not in metric:
+                metric['thresholds'] = []
+            metric['thresholds'].append(threshold)
+
+            if violated is not None:
+                metric['threshold_checks'].append((violated, value, threshold))
 
     def get_alerts(self, since: datetime = None) -> List[Dict[str, Any]]:
         """Get performance alerts."""
-        if since:
-            return [alert for alert in self.alerts if alert['timestamp'] > since]
-        return self.alerts[-100:]  # Last 100 alerts
+        # Copied out under the lock: a deque can't be iterated while the
+        # monitor thread appends to it
+        with self._metrics_lock:
+            if since:
+                # Alerts are in time order, so only the newest ones need checking
+                cutoff = since.timestamp()
+                alerts = list(takewhile(lambda alert: alert['timestamp'] > cutoff, reversed(self.alerts)))
+                alerts.reverse()
+            else:
+                alerts = list(islice(self.alerts, max(len(self.alerts) - 100, 0), None))  # Last 100 alerts
+
+        return [{**alert, 'timestamp': datetime.fromtimestamp(alert['timestamp'])} for alert in alerts]
+
+    def _new_metric(self, name: str, metric_type: str, tags: Dict[str, str] = None) -> Dict[str, Any]:
+        """Create the record for a newly seen metric."""
+        return {
+            'type': metric_type,
+            'prometheus_name': name.replace('.', '_').replace('-', '_'),
+            'values': _MetricSamples(1000),  # Keep last 1000 values
+            'tags': tags or {},
+            'threshold_checks': []  # (violated, value, threshold) for each alerting threshold
+        }
 
     def _monitor_loop(self):
         """Main monitoring loop."""
@@ -154,58 +307,50 @@ class PerformanceMonitor:
     def _collect_system_metrics(self):
         """Collect system performance metrics."""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            self.record_metric("system.cpu.percent", cpu_percent)
+            # Every metric of a collection shares one timestamp
+            now = time.time()
+
+            # CPU usage since the previous collection
+            cpu_percent = psutil.cpu_percent(interval=None)
+            self.record_metric("system.cpu.percent", cpu_percent, timestamp=now)
 
             # Memory usage
-            memory = psutil.virtual_memory()
-            self.record_metric("system.memory.percent", memory.percent)
-            self.record_metric("system.memory.used_mb", memory.used / 1024 / 1024)
+            memory_percent, memory_used = _memory_usage()
+            self.record_metric("system.memory.percent", memory_percent, timestamp=now)
+            self.record_metric("system.memory.used_mb", memory_used / 1024 / 1024, timestamp=now)
 
             # Disk usage
-            disk = psutil.disk_usage('/')
-            self.record_metric("system.disk.percent", disk.percent)
-            self.record_metric("system.disk.free_gb", disk.free / 1024 / 1024 / 1024)
+            disk_percent, disk_free = _disk_usage('/')
+            self.record_metric("system.disk.percent", disk_percent, timestamp=now)
+            self.record_metric("system.disk.free_gb", disk_free / 1024 / 1024 / 1024, timestamp=now)
 
             # Network I/O
-            net_io = psutil.net_io_counters()
-            self.record_metric("system.network.bytes_sent_mb", net_io.bytes_sent / 1024 / 1024)
-            self.record_metric("system.network.bytes_recv_mb", net_io.bytes_recv / 1024 / 1024)
+            bytes_sent, bytes_recv = _network_io()
+            self.record_metric("system.network.bytes_sent_mb", bytes_sent / 1024 / 1024, timestamp=now)
+            self.record_metric("system.network.bytes_recv_mb", bytes_recv / 1024 / 1024, timestamp=now)
 
         except Exception as e:
             self.logger.error(f"Failed to collect system metrics: {str(e)}")
 
-    def _check_thresholds(self, metric_name: str, value: float):
-        """Check if metric value violates any thresholds."""
+    def _check_thresholds(self, metric_name: str, value: float, timestamp: float = None):
+        """Check if metric value, recorded at timestamp (time.time()), violates any thresholds."""
         if metric_name not in self.metrics:
             return
 
         metric = self.metrics[metric_name]
-        thresholds = metric.get('thresholds', [])
-
-        for threshold in thresholds:
-            violated = False
-
-            if threshold['type'] == 'max' and value > threshold['value']:
-                violated = True
-            elif threshold['type'] == 'min' and value < threshold['value']:
-                violated = True
 
-            if violated:
+        for violated, limit, threshold in metric['threshold_checks']:
+            if violated(value, limit):
                 alert = {
                     'metric': metric_name,
                     'value': value,
                     'threshold': threshold,
-                    'timestamp': datetime.now(),
+                    'timestamp': time.time() if timestamp is None else timestamp,
                     'message': f"Threshold violation: {metric_name} {threshold['type']} {threshold['value']} (current: {value})"
                 }
 
-                self.alerts.append(alert)
-
-                # Keep only last 1000 alerts
-                if len(self.alerts) > 1000:
-                    self.alerts = self.alerts[-1000:]
+                with self._metrics_lock:
+                    self.alerts.append(alert)
 
                 # Log alert
                 log_level = 'warning' if threshold['alert_level'] == 'warning' else 'error'
@@ -217,38 +362,29 @@ class PerformanceMonitor:
 class MetricsExporter:
     """Export metrics to external monitoring systems."""
 
+    CSV_HEADER = ('metric_name', 'type', 'count', 'current', 'min', 'max', 'avg', 'last_updated')
+
     def __init__(self, monitor: PerformanceMonitor):
         self.monitor = monitor
         self.logger = Logger("MetricsExporter")
+        self.formatter = DataFormatter()
 
     def export_to_prometheus(self) -> str:
         """Export metrics in Prometheus format."""
         lines = []
+        append = lines.append
 
-        for name, metric_data in self.monitor.get_all_metrics().items():
-            if not metric_data:
-                continue
-
-            # Convert metric name to Prometheus format
-            prom_name = name.replace('.', '_').replace('-', '_')
-
-            # Add metric type
-            metric_type = metric_data['type']
-            if metric_type == 'counter':
-                lines.append(f"# TYPE {prom_name} counter")
-            else:
-                lines.append(f"# TYPE {prom_name} gauge")
-
-            # Add metric value
-            value = metric_data['current']
-            if value is not None:
-                lines.append(f"{prom_name} {value}")
+        # Only the current values are exported, so the full statistics
+        # get_all_metrics computes aren't needed
+        for prom_name, metric_type, value in self.monitor.iter_current():
+            append(f"# TYPE {prom_name} {'counter' if metric_type == 'counter' else 'gauge'}")
+            append(f"{prom_name} {value}")
 
         return '\n'.join(lines)
 
     def export_to_json(self) -> str:
-        """Export metrics as JSON."""
-        return self.monitor.config.get('formatter').to_json(self.monitor.get_all_metrics())
+        """Export metrics as compact JSON."""
+        return self.formatter.to_json(self.monitor.get_all_metrics(), compact=True)
 
     def export_to_csv(self) -> str:
         """Export metrics as CSV."""
@@ -256,23 +392,25 @@ class MetricsExporter:
         if not metrics:
             return "No metrics available"
 
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+
         # Header
-        header = "metric_name,type,count,current,min,max,avg,last_updated"
+        writer.writerow(self.CSV_HEADER)
 
         # Data rows
-        rows = []
-        for name, data in metrics.items():
-            if data:
-                row = [
-                    name,
-                    data['type'],
-                    str(data['count']),
-                    str(data['current'] or ''),
-                    str(data['min'] or ''),
-                    str(data['max'] or ''),
-                    str(data['avg'] or ''),
-                    data['last_updated'].isoformat() if data['last_updated'] else ''
-                ]
-                rows.append(','.join(row))
-
-        return '\n'.join([header] + rows)
\ No newline at end of file
+        writer.writerows(
+            [
+                name,
+                data['type'],
+                data['count'],
+                data['current'],
+                data['min'],
+                data['max'],
+                data['avg'],
+                data['last_updated'].isoformat() if data['last_updated'] else ''
+            ]
+            for name, data in metrics.items() if data
+        )
+
+        return buffer.getvalue().rstrip('\n')
\ No newline at end of file
@@ -1,8 +1,11 @@
 import os
 import json
 import argparse
-from collections import defaultdict
-from analyzer import analyze_file
+try:
+    import orjson
+except ImportError:  # optional, the json module writes the output without it
+    orjson = None
+from analyzer import analyze_files
 from utils import get_py_files
 
 
@@ -11,10 +14,18 @@ def normalize_dir(path):
 
 
 def is_within(root, candidate):
-    try:
-        return os.path.commonpath([root, candidate]) == root
-    except ValueError:
-        return False
+    # Both are normalized absolute paths, so a prefix check ending at a path
+    # separator gives the same answer as comparing os.path.commonpath
+    root = os.path.normcase(root)
+    candidate = os.path.normcase(candidate)
+    if candidate == root:
+        return True
+    return candidate.startswith(root if root.endswith(os.sep) else root + os.sep)
+
+
+def prefix_length(root):
+    """Length of root as a prefix of paths below it, trailing separator included."""
+    return len(root) if root.endswith(os.sep) else len(root) + 1
 
 
 def main():
@@ -51,12 +62,33 @@ def main():
         default=os.path.join(script_dir, 'output.json'),
         help='Destination path for the generated JSON (default: backend/output.json).'
     )
+    parser.add_argument(
+        '--cache-dir',
+        dest='cache_dir',
+        default=None,
+        help='Directory for cached per-file analysis results, reused while files are unchanged (default: no cache).'
+    )
+    parser.add_argument(
+        '--workers',
+        dest='workers',
+        type=int,
+        default=None,
+        help='Number of processes analyzing files in parallel; 1 analyzes them in this process (default: one per CPU).'
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Write indented JSON for reading by hand (default: compact JSON).'
+    )
     args = parser.parse_args()
 
     scan_root = normalize_dir(args.scan_root_pos) if args.scan_root_pos else normalize_dir(args.scan_root)
     focus_root = normalize_dir(args.focus_root_pos) if args.focus_root_pos else normalize_dir(args.focus_root)
     output_path = os.path.abspath(args.output_path)
+    cache_dir = os.path.abspath(args.cache_dir) if args.cache_dir else None
 
+    if args.workers is not None and args.workers < 1:
+        raise ValueError('--workers must be at least 1.')
     if not os.path.isdir(scan_root):
         raise FileNotFoundError(f'Scan root does not exist: {scan_root}')
     if not os.path.isdir(focus_root):
@@ -67,11 +99,14 @@ def main():
     py_files = get_py_files(scan_root)
     file_module_info = {}
     module_to_file = {}
+    # get_py_files joins every path onto scan_root, so the relative path is
+    # a slice rather than an os.path.relpath call per file
+    scan_prefix = prefix_length(scan_root)
     for file_path in py_files:
-        rel_path = os.path.relpath(file_path, scan_root)
-        module = rel_path.replace(os.sep, '.').replace('.py', '')
+        rel_path = file_path[scan_prefix:]
+        module = rel_path[:-len('.py')].replace(os.sep, '.')
         display = f'from {module}'
-        file_module_info[file_path] = {'module': module, 'display': display}
+        file_module_info[file_path] = (module, display)
         module_to_file[module] = file_path
         if module.endswith('__init__'):
             package_name = module.rsplit('.', 1)[0] if '.' in module else ''
@@ -79,44 +114,65 @@ def main():
                 module_to_file[package_name] = file_path
 
     files_data = {}
-    for file_path in py_files:
-        data = analyze_file(file_path)
+    for file_path, data in analyze_files(py_files, workers=args.workers, cache_dir=cache_dir).items():
         if data:
             files_data[file_path] = data['definitions']
 
-    symbol_to_file = defaultdict(list)
+    # Entries are (file_path, display) pairs. Most names are defined once,
+    # so a name maps to its single entry, and only to a list of entries when
+    # it is defined in several places
+    symbol_to_file = {}
     for file_path, definitions in files_data.items():
-        module_display = file_module_info[file_path]['display']
+        entry = (file_path, file_module_info[file_path][1])
         for def_name in definitions:
-            symbol_to_file[def_name].append({'file_path': file_path, 'display': module_display})
-
+            existing = symbol_to_file.get(def_name)
+            if existing is None:
+                symbol_to_file[def_name] = entry
+            elif isinstance(existing, list):
+                existing.append(entry)
+            else:
+                symbol_to_file[def_name] = [existing, entry]
+
+    # Nest methods under their classes in one pass over each file's
+    # definitions; classes still come first, then the plain functions. The
+    # function dicts are this run's own, so they're used without copying.
     for file_path, definitions in files_data.items():
         new_definitions = {}
+        functions = {}
+        methods = []
         for def_name, def_data in definitions.items():
             if def_data['type'] == 'class':
                 class_data = dict(def_data)
                 class_data['methods'] = {}
                 new_definitions[def_name] = class_data
-        for def_name, def_data in definitions.items():
-            if def_data['type'] == 'function' and '.' in def_name:
-                class_name, method_name = def_name.split('.', 1)
-                if class_name in new_definitions:
-                    new_definitions[class_name]['methods'][method_name] = dict(def_data)
             elif def_data['type'] == 'function':
-                new_definitions[def_name] = dict(def_data)
+                if '.' in def_name:
+                    methods.append((def_name, def_data))
+                else:
+                    functions[def_name] = def_data
+        for def_name, def_data in methods:
+            class_name, method_name = def_name.split('.', 1)
+            if class_name in new_definitions:
+                new_definitions[class_name]['methods'][method_name] = def_data
+        new_definitions.update(functions)
         files_data[file_path] = new_definitions
 
     focus_files = {path for path in files_data.keys() if is_within(focus_root, path)}
 
     def resolve_symbol(name, preferred_file=None):
-        entries = symbol_to_file.get(name, [])
-        if preferred_file:
-            for entry in entries:
-                if entry['file_path'] == preferred_file and entry['file_path'] in focus_files:
-                    return entry
-        for entry in entries:
-            if entry['file_path'] in focus_files:
-                return entry
+        """Display string of the focus file defining name, if there is one."""
+        entries = symbol_to_file.get(name)
+        if entries is None:
+            return None
+        if not isinstance(entries, list):
+            entries = (entries,)
+        if preferred_file and preferred_file in focus_files:
+            for def_file, display in entries:
+                if def_file == preferred_file:
+                    return display
+        for def_file, display in entries:
+            if def_file in focus_files:
+                return display
         return None
 
     def build_used_functions(def_data):
@@ -124,12 +180,12 @@ def main():
         for name in def_data.get('used_names', set()):
             target = resolve_symbol(name)
             if target:
-                used_functions[name] = target['display']
+                used_functions[name] = target
         for base, methods in def_data.get('used_classes_methods', {}).items():
             target = resolve_symbol(base)
             if target and methods:
                 used_functions[base] = {
-                    'file': target['display'],
+                    'file': target,
                     'methods': sorted(methods)
                 }
                 continue
@@ -138,7 +194,7 @@ def main():
                 for method_name in sorted(methods):
                     method_target = resolve_symbol(method_name, preferred_file=module_file)
                     if method_target:
-                        used_functions[method_name] = method_target['display']
+                        used_functions[method_name] = method_target
         def_data['used_functions'] = used_functions
         def_data.pop('used_names', None)
         def_data.pop('used_classes_methods', None)
@@ -151,17 +207,17 @@ def main():
                 for method_data in def_data['methods'].values():
                     build_used_functions(method_data)
 
-    parent_dir = os.path.dirname(scan_root)
+    parent_prefix = prefix_length(os.path.dirname(scan_root))
     output_files = {}
     output_meta = {}
     for file_path, data in files_data.items():
         if file_path not in focus_files:
             continue
-        rel_path = os.path.relpath(file_path, parent_dir).replace(os.sep, '/')
+        rel_path = file_path[parent_prefix:].replace(os.sep, '/')
         output_files[rel_path] = data
         output_meta[rel_path] = {
             'is_router': os.path.basename(file_path) == '__init__.py',
-            'module': file_module_info[file_path]['module']
+            'module': file_module_info[file_path][0]
         }
 
     output = {
@@ -176,8 +232,16 @@ def main():
     output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=4)
+    if orjson is not None and not args.pretty:
+        # Same compact UTF-8 text as the json branch, encoded in one C call
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if args.pretty:
+                json.dump(output, f, indent=4)
+            else:
+                json.dump(output, f, separators=(',', ':'), ensure_ascii=False)
     print(f'Analysis complete. Output saved to {output_path}')
 
 # Usage: python main.py [scan_root] [focus_root]
@@ -2,66 +2,56 @@ import os
 from collections import defaultdict
 
 def get_py_files(root_dir):
+    # Same files, in the same order, as walking the tree with os.walk, but
+    # straight from os.scandir entries, whose cached file types save a stat
+    # per entry and the per-directory name lists os.walk builds
     py_files = []
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith('.py'):
-                py_files.append(os.path.join(dirpath, filename))
+    pending = [root_dir]
+    while pending:
+        dir_path = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk, list symlinked directories but don't enter them
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.py'):
+                        py_files.append(entry.path)
+        except OSError:
+            continue
+        # Visited depth first, in listing order
+        pending.extend(reversed(subdirs))
     return py_files
 
 def resolve_import(imp, file_path, root_dir, all_files):
+    # all_files holds os.path.normpath-normalized paths, as candidates are
     module_path = imp['module'].replace('.', os.sep) + '.py'
     possible_paths = [os.path.join(root_dir, module_path), os.path.join(os.path.dirname(file_path), module_path)]
     for p in possible_paths:
+        p = os.path.normpath(p)
         if p in all_files:
             return p
     return None
 
 def build_relationships(files_data, root_dir):
-    # Build symbol to file mapping
-    symbol_to_file = defaultdict(list)
-    for file_path, data in files_data.items():
-        if data:
-            for cls in data['classes']:
-                symbol_to_file[cls['name']].append(file_path)
-            for func in data['functions']:
-                symbol_to_file[func['name']].append(file_path)
+    # Import targets are looked up among the analyzed files rather than on
+    # disk, by normalized path, so "./" and ".." in either side still match
+    all_files = {os.path.normpath(path): path for path in files_data}
 
-    relationships = defaultdict(set)
-    for file_path, data in files_data.items():
-        if not data:
-            continue
-        # From imports
-        for imp in data['imports']:
-            # For simplicity, assume module name corresponds to file
-            # This is rough; real module resolution is complex
-            module_path = imp['module'].replace('.', os.sep) + '.py'
-            possible_paths = [os.path.join(root_dir, module_path)]
-            # Also check relative
-            rel_path = os.path.join(os.path.dirname(file_path), module_path)
-            possible_paths.append(rel_path)
-            for p in possible_paths:
-                if os.path.exists(p):
-                    relationships[file_path].add(p)
-                    break
-        # From usages
-        defined_in_file = {cls['name'] for cls in data['classes']} | {func['name'] for func in data['functions']}
-        imported_names = {imp['as'] or imp['module'].split('.')[-1] for imp in data['imports']}
-        for name in data['used_names']:
-            if name not in defined_in_file and name not in imported_names:
-                if name in symbol_to_file:
-                    for dep_file in symbol_to_file[name]:
-                        relationships[file_path].add(dep_file)
-
-    return {k: list(v) for k, v in relationships.items()}
-    # Build symbol to file mapping
-    symbol_to_file = defaultdict(list)
+    # Build symbol to file mapping; sets, so a use adds them in one union
+    symbol_to_file = defaultdict(set)
     for file_path, data in files_data.items():
         if data:
             for cls in data['classes']:
-                symbol_to_file[cls['name']].append(file_path)
+                symbol_to_file[cls['name']].add(file_path)
             for func in data['functions']:
-                symbol_to_file[func['name']].append(file_path)
+                symbol_to_file[func['name']].add(file_path)
 
     relationships = defaultdict(set)
     for file_path, data in files_data.items():
@@ -77,16 +67,17 @@ def build_relationships(files_data, root_dir):
             rel_path = os.path.join(os.path.dirname(file_path), module_path)
             possible_paths.append(rel_path)
             for p in possible_paths:
-                if os.path.exists(p):
-                    relationships[file_path].add(p)
+                target = all_files.get(os.path.normpath(p))
+                if target is not None:
+                    relationships[file_path].add(target)
                     break
         # From usages
         defined_in_file = {cls['name'] for cls in data['classes']} | {func['name'] for func in data['functions']}
-        imported_names = {imp['as'] or imp['module'].split('.')[-1] for imp in data['imports']}
+        imported_names = {imp['as'] or imp['module'].rsplit('.', 1)[-1] for imp in data['imports']}
         for name in data['used_names']:
             if name not in defined_in_file and name not in imported_names:
-                if name in symbol_to_file:
-                    for dep_file in symbol_to_file[name]:
-                        relationships[file_path].add(dep_file)
+                dep_files = symbol_to_file.get(name)
+                if dep_files:
+                    relationships[file_path] |= dep_files
 
-    return {k: list(v) for k, v in relationships.items()}
\ No newline at end of file
+    return {k: list(v) for k, v in relationships.items()}